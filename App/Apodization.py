@@ -0,0 +1,102 @@
+import numpy as np
+
+TAPERS = ('uniform', 'hamming', 'taylor', 'chebyshev')
+
+
+def hamming_weights(num_elements):
+    """Hamming taper 0.54 - 0.46 * cos(2 * pi * n / (N - 1)), peak-normalized."""
+    if num_elements == 1:
+        return np.ones(1)
+    weights = 0.54 - 0.46 * np.cos(2 * np.pi * np.arange(num_elements) / (num_elements - 1))
+    return weights / weights.max()
+
+
+def taylor_weights(num_elements, sidelobe_db=30, nbar=4):
+    """
+    Taylor taper with ``nbar`` nearly constant-level sidelobes ``sidelobe_db`` below the main lobe, peak-normalized.
+    """
+    if num_elements == 1:
+        return np.ones(1)
+    amplitude = np.arccosh(10 ** (sidelobe_db / 20)) / np.pi
+    sigma2 = nbar ** 2 / (amplitude ** 2 + (nbar - 0.5) ** 2)
+    orders = np.arange(1, nbar)
+    orders2 = orders ** 2
+
+    # Fourier coefficients of the Taylor aperture distribution
+    coefficients = np.empty(nbar - 1)
+    for index, order in enumerate(orders):
+        numerator = (-1) ** index * np.prod(1 - orders2[index] / sigma2 / (amplitude ** 2 + (orders - 0.5) ** 2))
+        denominator = 2 * np.prod(1 - orders2[index] / orders2[:index]) * np.prod(1 - orders2[index] / orders2[index + 1:])
+        coefficients[index] = numerator / denominator
+
+    def distribution(n):
+        return 1 + 2 * coefficients @ np.cos(2 * np.pi * orders[:, None] * (n - num_elements / 2 + 0.5) / num_elements)
+
+    weights = distribution(np.arange(num_elements, dtype=np.float64))
+    return weights / weights.max()
+
+
+def chebyshev_weights(num_elements, sidelobe_db=30):
+    """Dolph-Chebyshev taper with equal sidelobes ``sidelobe_db`` below the main lobe, peak-normalized."""
+    if num_elements == 1:
+        return np.ones(1)
+    order = num_elements - 1
+    beta = np.cosh(np.arccosh(10 ** (sidelobe_db / 20)) / order)
+    x = beta * np.cos(np.pi * np.arange(num_elements) / num_elements)
+
+    # Chebyshev polynomial of degree ``order`` sampled around the unit circle
+    samples = np.empty(num_elements)
+    above, below = x > 1, x < -1
+    inside = ~(above | below)
+    samples[above] = np.cosh(order * np.arccosh(x[above]))
+    samples[below] = (2 * (num_elements % 2) - 1) * np.cosh(order * np.arccosh(-x[below]))
+    samples[inside] = np.cos(order * np.arccos(x[inside]))
+
+    if num_elements % 2:
+        weights = np.real(np.fft.fft(samples))
+        half = (num_elements + 1) // 2
+        weights = np.concatenate((weights[half - 1:0:-1], weights[:half]))
+    else:
+        weights = np.real(np.fft.fft(samples * np.exp(1j * np.pi / num_elements * np.arange(num_elements))))
+        half = num_elements // 2 + 1
+        weights = np.concatenate((weights[half - 1:0:-1], weights[1:half]))
+    return weights / weights.max()
+
+
+def apodization_weights(spec, num_elements):
+    """
+    Resolve the ``weights`` entry of an ``arrays_info`` dict into per-element complex weights.
+
+    Args:
+        spec: None or 'uniform' for unit weights; a taper name ('hamming', 'taylor', 'chebyshev');
+            a dict with a 'taper' name and its keyword arguments, e.g.
+            ``{'taper': 'taylor', 'sidelobe_db': 35, 'nbar': 5}``; or a custom array of
+            ``num_elements`` complex weights.
+        num_elements (int): Number of elements of the array.
+
+    Returns:
+        weights (numpy.ndarray): (num_elements,) complex weights, or None for uniform unit weights.
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        spec = {'taper': spec}
+    if isinstance(spec, dict):
+        options = dict(spec)
+        taper = options.pop('taper', 'uniform')
+        if taper == 'uniform':
+            return None
+        if taper == 'hamming':
+            weights = hamming_weights(num_elements, **options)
+        elif taper == 'taylor':
+            weights = taylor_weights(num_elements, **options)
+        elif taper == 'chebyshev':
+            weights = chebyshev_weights(num_elements, **options)
+        else:
+            raise ValueError(f"Taper must be one of {', '.join(TAPERS)}")
+        return weights.astype(np.complex128)
+
+    weights = np.asarray(spec, dtype=np.complex128)
+    if weights.shape != (num_elements,):
+        raise ValueError(f"Custom weights must have one entry per element ({num_elements}), got shape {weights.shape}")
+    return weights
@@ -0,0 +1,277 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from App.Geometry import array_offsets
+from App.Simulation import BeamformingSimulator
+
+# Sweep axes in expansion order, with the values used when a spec leaves one out.
+# Steering varies fastest so consecutive configurations reuse the cached propagation phasors.
+SWEEP_AXES = {
+    'frequency': [100e3],  # Hz, or the spinbox value when a frequency_bandwidth_index is given
+    'frequency_bandwidth_index': [None],  # Kilo/Mega/Giga/... combobox index, as in the scenario settings
+    'num_elements': [2],
+    'curvature': [0],  # Degrees
+    'elements_spacing': [5],  # Percent of the wavelength, as on the elements spacing slider
+    'arrays_number': [1],
+    'steering_angle': [0]  # Degrees
+}
+
+
+def expand_sweep(spec):
+    """
+    Expand a sweep spec into the Cartesian product of its axes.
+
+    Args:
+        spec (dict): Maps axis names from ``SWEEP_AXES`` to a value or a list of values.
+
+    Returns:
+        configurations (list): One dict per configuration, in deterministic axis order.
+    """
+    unknown = set(spec) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"Unknown sweep axes: {', '.join(sorted(unknown))}")
+
+    axes = []
+    for name, default in SWEEP_AXES.items():
+        values = spec.get(name, default)
+        axes.append(values if isinstance(values, (list, tuple)) else [values])
+    return [dict(zip(SWEEP_AXES, values)) for values in itertools.product(*axes)]
+
+
+def operating_frequency(configuration):
+    index = configuration.get('frequency_bandwidth_index')
+    if index is None:
+        return configuration['frequency']
+    return configuration['frequency'] * 10 ** (3 * (index + 1))
+
+
+def build_arrays_info(configuration):
+    wavelength = 3e8 / operating_frequency(configuration)
+    spacing = (configuration['elements_spacing'] / 100) * wavelength
+    # Arrays are placed side by side exactly as the application places them
+    return [{
+        'num_elements': int(configuration['num_elements']),
+        'spacing': spacing,
+        'curvature': configuration['curvature'],
+        'offset': offset
+    } for offset in array_offsets(int(configuration['arrays_number']))]
+
+
+def run_configuration(configuration, x_range=(-10, 10), y_range=(0, 10), resolution=(200, 200), angles=None, simulator=None):
+    """
+    Simulate one sweep configuration.
+
+    Passing the same ``simulator`` across calls keeps its geometry and phasor caches warm.
+
+    Returns:
+        result (dict): x, y, intensity, angles and array_factor arrays.
+    """
+    angles = np.linspace(-90, 90, 500) if angles is None else np.asarray(angles)
+    arrays_info = build_arrays_info(configuration)
+    frequency = operating_frequency(configuration)
+    if simulator is None:
+        simulator = BeamformingSimulator(frequency, configuration['steering_angle'], arrays_info)
+    else:
+        simulator.arrays_info = arrays_info
+        simulator.update_operating_frequency(frequency)
+        simulator.update_steering_angle(configuration['steering_angle'])
+
+    x, y, intensity = simulator.simulate_multiple_arrays(x_range, y_range, resolution)
+    return {
+        'x': x,
+        'y': y,
+        'intensity': intensity,
+        'angles': angles,
+        'array_factor': simulator.calculate_array_factor(angles)
+    }
+
+
+def save_result(path, result):
+    np.savez_compressed(path, **result)
+
+
+def result_file_name(number):
+    return f"configuration_{number:06d}.npz"
+
+
+# Each pool process keeps one simulator so its geometry and phasor caches survive across shards
+_worker_simulator = None
+_worker_threads = None  # Field engine threads per simulator; None uses every core (in-process sweeps)
+
+
+def _init_pool_process(threads):
+    # Pool processes share the cores, so each simulator only gets its share of them
+    global _worker_simulator, _worker_threads
+    _worker_simulator = None
+    _worker_threads = threads
+
+
+def _run_shard(shard, output, x_range, y_range, resolution, angles):
+    global _worker_simulator
+    if _worker_simulator is None:
+        _worker_simulator = BeamformingSimulator(SWEEP_AXES['frequency'][0], SWEEP_AXES['steering_angle'][0], [],
+                                                 threads=_worker_threads)
+
+    completed = []
+    for number, configuration in shard:
+        result = run_configuration(configuration, x_range, y_range, resolution, angles, _worker_simulator)
+        save_result(os.path.join(output, result_file_name(number)), result)
+        completed.append(number)
+    return completed
+
+
+def sweep_fingerprint(configurations, x_range, y_range, resolution, angles):
+    description = json.dumps([configurations, list(x_range), list(y_range), list(resolution), len(angles)], sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def load_checkpoint(path, fingerprint):
+    """
+    Return the configuration numbers already completed according to a checkpoint file.
+
+    The first line records the sweep fingerprint; every following line lists the numbers
+    finished by one shard. A checkpoint written for a different sweep is rejected.
+    """
+    if not os.path.exists(path):
+        return set()
+
+    completed = set()
+    with open(path) as checkpoint_file:
+        header = json.loads(checkpoint_file.readline() or "{}")
+        if header.get('sweep') != fingerprint:
+            raise ValueError(f"Checkpoint {path} belongs to a different sweep; remove it or choose another output")
+        for line in checkpoint_file:
+            try:
+                completed.update(json.loads(line)['completed'])
+            except (ValueError, KeyError):
+                break  # A partially written last line from an interrupted run
+    return completed
+
+
+def print_progress(done, total, elapsed):
+    remaining = (total - done) * elapsed / done if done else 0
+    print(f"[{done}/{total}] {elapsed:.1f} s elapsed, ~{remaining:.1f} s remaining", file=sys.stderr, flush=True)
+
+
+def run_sweep(configurations, output, x_range=(-10, 10), y_range=(0, 10), resolution=(200, 200), angles=None,
+              workers=1, shard_size=None, checkpoint=None, progress=print_progress):
+    """
+    Simulate every configuration, sharded across a process pool, and write the results to ``output``.
+
+    Configurations are numbered in expansion order and the index is written in that order
+    whatever the completion order. Finished shards are appended to the checkpoint file, so
+    a restarted sweep only computes what is missing.
+
+    Args:
+        configurations (list): Configuration dicts, e.g. from ``expand_sweep``.
+        output (str): Directory for the .npz results and sweep_index.json.
+        workers (int): Number of processes; 1 runs in the calling process on every core, more split the cores between the processes.
+        shard_size (int): Consecutive configurations per task; defaults to about four shards per worker.
+        checkpoint (str): Checkpoint file path; defaults to ``output/sweep_checkpoint.jsonl``.
+        progress (callable): Called as ``progress(done, total, elapsed_seconds)`` after each shard, or None.
+
+    Returns:
+        index (list): One {'file', 'configuration'} entry per configuration.
+    """
+    angles = np.linspace(-90, 90, 500) if angles is None else np.asarray(angles)
+    os.makedirs(output, exist_ok=True)
+    checkpoint = checkpoint or os.path.join(output, "sweep_checkpoint.jsonl")
+    fingerprint = sweep_fingerprint(configurations, x_range, y_range, resolution, angles)
+
+    completed = {number for number in load_checkpoint(checkpoint, fingerprint)
+                 if os.path.exists(os.path.join(output, result_file_name(number)))}
+    pending = [(number, configuration) for number, configuration in enumerate(configurations) if number not in completed]
+
+    workers = max(1, int(workers))
+    shard_size = shard_size or max(1, -(-len(pending) // (workers * 4)))
+    shards = [pending[start:start + shard_size] for start in range(0, len(pending), shard_size)]
+
+    if not os.path.exists(checkpoint) or not completed:
+        with open(checkpoint, "w") as checkpoint_file:
+            checkpoint_file.write(json.dumps({'sweep': fingerprint, 'total': len(configurations)}) + "\n")
+
+    started = time.perf_counter()
+    with open(checkpoint, "a") as checkpoint_file:
+        def record(numbers):
+            completed.update(numbers)
+            checkpoint_file.write(json.dumps({'completed': numbers}) + "\n")
+            checkpoint_file.flush()
+            if progress:
+                progress(len(completed), len(configurations), time.perf_counter() - started)
+
+        if workers == 1:
+            for shard in shards:
+                record(_run_shard(shard, output, x_range, y_range, resolution, angles))
+        else:
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_process, initargs=(threads,)) as executor:
+                futures = [executor.submit(_run_shard, shard, output, x_range, y_range, resolution, angles) for shard in shards]
+                for future in as_completed(futures):
+                    record(future.result())
+
+    index = [{'file': result_file_name(number), 'configuration': configuration} for number, configuration in enumerate(configurations)]
+    with open(os.path.join(output, "sweep_index.json"), "w") as index_file:
+        json.dump(index, index_file, indent=2)
+    return index
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run beamforming parameter sweeps without the GUI.")
+    parser.add_argument('--spec', help="JSON file mapping sweep axes to lists of values")
+    parser.add_argument('--frequencies', type=float, nargs='+', help="Operating frequencies in Hz")
+    parser.add_argument('--steering-angles', type=float, nargs='+', help="Steering angles in degrees")
+    parser.add_argument('--elements', type=int, nargs='+', help="Numbers of elements per array")
+    parser.add_argument('--curvatures', type=float, nargs='+', help="Array curvatures in degrees")
+    parser.add_argument('--spacings', type=float, nargs='+', help="Element spacings in percent of the wavelength")
+    parser.add_argument('--arrays', type=int, nargs='+', help="Numbers of arrays")
+    parser.add_argument('--x-range', type=float, nargs=2, default=(-10, 10))
+    parser.add_argument('--y-range', type=float, nargs=2, default=(0, 10))
+    parser.add_argument('--resolution', type=int, nargs=2, default=(200, 200), help="Grid size as x points, y points")
+    parser.add_argument('--angles', type=int, default=500, help="Number of beam profile angles between -90 and 90 degrees")
+    parser.add_argument('--output', default="Sweep", help="Directory for the results and sweep_index.json")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes")
+    parser.add_argument('--shard-size', type=int, help="Configurations per worker task")
+    parser.add_argument('--checkpoint', help="Checkpoint file used to resume an interrupted sweep")
+    return parser.parse_args(argv)
+
+
+def sweep_spec_from_args(args):
+    spec = {}
+    if args.spec:
+        with open(args.spec) as spec_file:
+            spec.update(json.load(spec_file))
+
+    overrides = {
+        'frequency': args.frequencies,
+        'steering_angle': args.steering_angles,
+        'num_elements': args.elements,
+        'curvature': args.curvatures,
+        'elements_spacing': args.spacings,
+        'arrays_number': args.arrays
+    }
+    spec.update({name: values for name, values in overrides.items() if values is not None})
+    return spec
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configurations = expand_sweep(sweep_spec_from_args(args))
+
+    started = time.perf_counter()
+    run_sweep(configurations, args.output, args.x_range, args.y_range, args.resolution, np.linspace(-90, 90, args.angles),
+              workers=args.workers, shard_size=args.shard_size, checkpoint=args.checkpoint)
+
+    print(f"{len(configurations)} configurations written to {args.output} in {time.perf_counter() - started:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
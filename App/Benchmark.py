@@ -0,0 +1,187 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from App.Field_Backends import available_backends
+from App.Simulation import BeamformingSimulator
+
+# Default benchmark matrix; array counts follow the arrays_number_SpinBox limits (1-8)
+ELEMENT_COUNTS = (2, 16, 128, 1024)
+ARRAY_COUNTS = (1, 8)
+GRID_SIZES = ((100, 50), (200, 200))
+CURVATURES = (0, 90)
+
+FREQUENCY = 100e6  # Hz
+SPACING = 0.5 * 3e8 / FREQUENCY  # Half a wavelength
+STEERING_ANGLE = 20  # Degrees
+ANGLES = np.linspace(-90, 90, 500)
+
+
+def measure(function, repeats):
+    """
+    Run ``function`` ``repeats`` times.
+
+    Returns:
+        wall_seconds (float): Fastest wall time.
+        peak_bytes (int): Peak memory traced during the fastest run.
+    """
+    best_seconds, best_peak = float('inf'), 0
+    for _ in range(repeats):
+        tracemalloc.start()
+        started = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if seconds < best_seconds:
+            best_seconds, best_peak = seconds, peak
+    return best_seconds, best_peak
+
+
+def cold_simulator(num_elements, arrays_number, curvature, backend='numpy'):
+    """Return a simulator with its caches disabled, so every call measures the engine itself."""
+    arrays_info = [{'num_elements': num_elements, 'spacing': SPACING, 'curvature': curvature} for _ in range(arrays_number)]
+    return BeamformingSimulator(FREQUENCY, STEERING_ANGLE, arrays_info, phasor_cache_bytes=0, field_cache_bytes=0, backend=backend)
+
+
+def run_benchmarks(element_counts=ELEMENT_COUNTS, array_counts=ARRAY_COUNTS, grid_sizes=GRID_SIZES, curvatures=CURVATURES,
+                   repeats=3, report=print, backends=('numpy',)):
+    """
+    Time the simulation hot paths over the benchmark matrix.
+
+    The field is timed once per backend; cases of backends other than NumPy are named
+    ``simulate_multiple_arrays[backend]/...``. Each backend is warmed up first so compilation
+    is not timed.
+
+    Returns:
+        results (dict): Case name -> wall_seconds, peak_bytes and throughput (pixel-elements/s for
+            the field, angle-elements/s for the array factor, elements/s for the geometry).
+    """
+    results = {}
+
+    def record(name, wall_seconds, peak_bytes, work):
+        results[name] = {'wall_seconds': wall_seconds, 'peak_bytes': peak_bytes, 'throughput': work / wall_seconds}
+        if report:
+            report(f"{name:<60} {wall_seconds * 1e3:10.2f} ms {peak_bytes / 1024 ** 2:9.1f} MiB {work / wall_seconds:12.3e}/s")
+
+    for num_elements, arrays_number, curvature in itertools.product(element_counts, array_counts, curvatures):
+        simulator = cold_simulator(num_elements, arrays_number, curvature)
+        total_elements = num_elements * arrays_number
+
+        for backend in backends:
+            backend_simulator = cold_simulator(num_elements, arrays_number, curvature, backend)
+            backend_simulator.simulate_multiple_arrays((-10, 10), (0, 10), (2, 2))
+            name = "simulate_multiple_arrays" if backend == 'numpy' else f"simulate_multiple_arrays[{backend}]"
+            for x_points, y_points in grid_sizes:
+                wall, peak = measure(lambda: backend_simulator.simulate_multiple_arrays((-10, 10), (0, 10), (x_points, y_points)), repeats)
+                record(f"{name}/{num_elements}x{arrays_number}/curve{curvature:g}/{x_points}x{y_points}",
+                       wall, peak, total_elements * x_points * y_points)
+
+        wall, peak = measure(lambda: simulator.calculate_array_factor(ANGLES), repeats)
+        record(f"calculate_array_factor/{num_elements}x{arrays_number}/curve{curvature:g}", wall, peak, total_elements * len(ANGLES))
+
+    for num_elements, curvature in itertools.product(element_counts, curvatures):
+        simulator = cold_simulator(num_elements, 1, curvature)
+
+        def build_positions():
+            BeamformingSimulator.clear_element_positions_cache()
+            simulator.calculate_element_positions(num_elements, SPACING, curvature)
+
+        wall, peak = measure(build_positions, repeats)
+        record(f"calculate_element_positions/{num_elements}/curve{curvature:g}", wall, peak, num_elements)
+
+    return results
+
+
+def measure_thread_scaling(thread_counts, num_elements=1024, grid_size=(200, 200), repeats=3, report=print):
+    """
+    Time the NumPy field engine of one array at each thread count.
+
+    Returns:
+        scaling (dict): Thread count -> wall_seconds, speedup over the first count and
+            efficiency (speedup per thread relative to the first count).
+    """
+    scaling = {}
+    for threads in thread_counts:
+        simulator = cold_simulator(num_elements, 1, 0)
+        simulator.update_threads(threads)
+        wall, _ = measure(lambda: simulator.simulate_multiple_arrays((-10, 10), (0, 10), grid_size), repeats)
+        first_threads, first = next(iter(scaling.items()), (threads, {'wall_seconds': wall}))
+        speedup = first['wall_seconds'] / wall
+        scaling[threads] = {'wall_seconds': wall, 'speedup': speedup, 'efficiency': speedup * first_threads / threads}
+        if report:
+            report(f"threads={threads:<4} {wall * 1e3:10.2f} ms  speedup {speedup:6.2f}x  efficiency {scaling[threads]['efficiency']:6.1%}")
+    return scaling
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Return (case name, baseline seconds, current seconds) for every case slower than its baseline by more than ``tolerance``.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference and result['wall_seconds'] > reference['wall_seconds'] * (1 + tolerance):
+            regressions.append((name, reference['wall_seconds'], result['wall_seconds']))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the beamforming simulation hot paths.")
+    parser.add_argument('--elements', type=int, nargs='+', default=ELEMENT_COUNTS, help="Numbers of elements per array")
+    parser.add_argument('--arrays', type=int, nargs='+', default=ARRAY_COUNTS, help="Numbers of arrays")
+    parser.add_argument('--grids', type=int, nargs='+', default=[size for grid in GRID_SIZES for size in grid],
+                        help="Grid sizes as x points, y points pairs")
+    parser.add_argument('--curvatures', type=float, nargs='+', default=CURVATURES, help="Array curvatures in degrees")
+    parser.add_argument('--backends', nargs='+', default=available_backends(), choices=available_backends(),
+                        help="Field backends to time (default: every installed one)")
+    parser.add_argument('--threads', type=int, nargs='+',
+                        help="Also measure thread scaling of the field engine at these thread counts, e.g. 1 2 4 8 16 32")
+    parser.add_argument('--repeats', type=int, default=3, help="Runs per case; the fastest is kept")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON baseline to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown against the baseline (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if len(args.grids) % 2:
+        raise SystemExit("--grids takes x points, y points pairs")
+    grid_sizes = list(zip(args.grids[::2], args.grids[1::2]))
+
+    results = run_benchmarks(args.elements, args.arrays, grid_sizes, args.curvatures, args.repeats, backends=args.backends)
+    report = {
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(), 'numpy': np.__version__,
+                    'cpus': os.cpu_count()},
+        'results': results
+    }
+    if args.threads:
+        report['thread_scaling'] = measure_thread_scaling(args.threads, args.elements[-1], grid_sizes[-1], args.repeats)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        compared = len(set(results) & set(baseline.get('results', {})))
+        print(f"Compared {compared} of {len(results)} cases against {args.baseline}")
+        for name, reference, current in regressions:
+            print(f"REGRESSION {name}: {reference * 1e3:.2f} ms -> {current * 1e3:.2f} ms")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,24 @@
-from PyQt5 import QtWidgets, QtGui
+from PyQt5 import QtWidgets, QtGui, QtCore
 
 import math
+import time
+from contextlib import contextmanager
 import numpy as np
 import pyqtgraph as pg
 
 from App.UI.Design import Ui_MainWindow
 from App.Logging_Manager import LoggingManager
+from App.Performance_Monitor import PerformanceMonitor
+from App.Result_Store import ResultStore
 from App.Simulation import BeamformingSimulator
+from App.Simulation_Worker import SimulationWorker
 
 
 class MainController:
+    # Derived state, upstream first: parameters -> geometry -> field -> image.
+    # The image stage is produced when the worker's result arrives.
+    STAGES = ('geometry', 'field')
+
     def __init__(self, app):
         self.app = app
         self.main_window = QtWidgets.QMainWindow()
@@ -17,6 +26,41 @@ class MainController:
         self.view = Ui_MainWindow()
         self.logging = LoggingManager()
 
+        # Full simulated field and the currently visible (zoomed) window of the intensity map
+        self.field_x_range = (-10, 10)
+        self.field_y_range = (0, 10)
+        self.view_x_range = self.field_x_range
+        self.view_y_range = self.field_y_range
+
+        # Grid sizes (x points, y points): coarse while a slider is dragged, full on release
+        self.preview_resolution = (100, 50)
+        self.full_resolution = (400, 200)
+        # Previews trade a little accuracy for speed; see BeamformingSimulator.precision_report
+        self.preview_precision = 'single'
+        self.full_precision = 'double'
+        # Previews switch to plane waves beyond each array's Fraunhofer distance; see BeamformingSimulator.field_regions
+        self.preview_field_model = 'auto'
+        self.full_field_model = 'exact'
+
+        # Parameter changes mark derived stages dirty; each dirty stage is recomputed at most once per
+        # frame, or once at the end of a transaction
+        self.frame_interval_ms = 16
+        self.dirty_stages = set()
+        self.transaction_depth = 0
+        self.pending_preview = None  # Preview flag of the request scheduled for the next frame, None if nothing is scheduled
+        self.pending_since = None
+        self.last_submitted_parameters = None
+
+        # Simulations run on a worker thread; results come back through result_ready.
+        # Full-resolution results are kept on disk so reopened configurations are not recomputed.
+        self.performance = PerformanceMonitor(logger=self.logging)
+        self.simulation_worker = SimulationWorker(result_store=ResultStore(), monitor=self.performance, logger=self.logging)
+        self.simulation_worker.result_ready.connect(self.display_simulation_result)
+        self.simulation_worker.request_failed.connect(self.simulation_failed)
+        self.app.aboutToQuit.connect(self.simulation_worker.stop)
+        self.app.aboutToQuit.connect(self.logging.close)
+        self.simulation_worker.start()
+
         self.initialize_view()
         self.initialize_arrays_info()
 
@@ -36,12 +80,36 @@ class MainController:
 
         self.view.steering_angle_slider.valueChanged.connect(self.update_steering_label)
         self.view.steering_angle_slider.valueChanged.connect(self.update_steering_angle)
+        self.view.steering_angle_slider.sliderReleased.connect(self.render_full_resolution)
+        self.view.elements_spacing_slider.sliderReleased.connect(self.render_full_resolution)
+
+        intensity_view_box = self.view.intensityMapItem.getViewBox()
+        intensity_view_box.setLimits(xMin=self.field_x_range[0], xMax=self.field_x_range[1],
+                                     yMin=self.field_y_range[0], yMax=self.field_y_range[1])
+        intensity_view_box.sigRangeChangedManually.connect(self.update_intensity_region)
+
+        # Full-resolution pass once zooming/panning the intensity map has settled
+        self.full_resolution_timer = QtCore.QTimer()
+        self.full_resolution_timer.setSingleShot(True)
+        self.full_resolution_timer.setInterval(250)
+        self.full_resolution_timer.timeout.connect(self.render_full_resolution)
+
+        # Slider and spin box triggers only mark stages dirty; the frame timer recomputes them
+        self.frame_timer = QtCore.QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(self.frame_interval_ms)
+        self.frame_timer.timeout.connect(self.refresh_dirty_stages)
 
         self.view.operating_frequency_spinbox.valueChanged.connect(self.update_operating_frequency)
         self.view.operating_frequency_range_combobox.currentIndexChanged.connect(self.update_spacing_frequency)
 
         self.view.quit_app_button.clicked.connect(self.close_application)
 
+        # F3 toggles the compute/render timing overlay
+        self.performance_overlay_enabled = False
+        self.performance_overlay_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence("F3"), self.main_window)
+        self.performance_overlay_shortcut.activated.connect(self.toggle_performance_overlay)
+
     def toggle_scenario(self):
         scenario_settings = {
             '5G': {
@@ -74,41 +142,37 @@ class MainController:
             current_index = scenarios.index(self.current_scenario)
             self.current_scenario = scenarios[(current_index + 1) % len(scenarios)]
 
-        self.logging.log(f"Switching scenario to {self.current_scenario}")
+        self.logging.log("Switching scenario to %s", self.current_scenario)
 
         scenario = scenario_settings[self.current_scenario]
 
-        # Update operating frequency
-        self.view.operating_frequency_spinbox.setValue(scenario['frequency'])
-        self.view.operating_frequency_range_combobox.setCurrentIndex(scenario['frequency_bandwidth_index'])
-        self.update_operating_frequency()
+        # Apply every setting before recomputing anything: the scenario costs one geometry refresh and one simulation
+        with self.transaction():
+            # Update operating frequency
+            self.view.operating_frequency_spinbox.setValue(scenario['frequency'])
+            self.view.operating_frequency_range_combobox.setCurrentIndex(scenario['frequency_bandwidth_index'])
+            self.update_operating_frequency()
+
+            # Update array settings
+            self.view.elements_spacing_slider.setValue(scenario['elements_spacing'])
+            self.update_elements_spacing()
 
-        # Update array settings
-        self.view.elements_spacing_slider.setValue(scenario['elements_spacing'])
-        self.update_elements_spacing()
+            self.view.array_curve_slider.setValue(scenario['curvature'])
+            self.update_elements_curvature()
 
-        self.view.array_curve_slider.setValue(scenario['curvature'])
-        self.update_elements_curvature()
+            self.view.elements_number_SpinBox.setValue(scenario['num_elements'])
+            self.update_current_elements_number()
 
-        self.view.elements_number_SpinBox.setValue(scenario['num_elements'])
-        self.update_current_elements_number()
+            self.view.scenarios_button.setText(self.current_scenario)
 
         # Log the updated settings
         self.logging.log(
-            f"""
-            Updated to scenario: {self.current_scenario}
-            Operating Frequency: {self.view.format_frequency(self.view.current_operating_frequency)},
-            Element Spacing: {self.view.current_elements_spacing} m,
-            Curvature: {self.view.current_array_curvature_angle} degrees,
-            Number of Elements: {scenario['num_elements']}
-            """
+            "Updated to scenario: %s, Operating Frequency: %s, Element Spacing: %s m, Curvature: %s degrees, "
+            "Number of Elements: %s",
+            self.current_scenario, self.view.format_frequency(self.view.current_operating_frequency),
+            self.view.current_elements_spacing, self.view.current_array_curvature_angle, scenario['num_elements']
         )
 
-        # Update UI and arrays
-        self.view.scenarios_button.setText(self.current_scenario)
-        self.view.updateVisualization()
-        self.update_and_refresh_arrays_info()
-
     def initialize_arrays_info(self):
         # Start with an empty list of configurations
         self.configurations = []
@@ -122,27 +186,25 @@ class MainController:
             'curvature': curvature
         })
         self.model = BeamformingSimulator(self.view.current_operating_frequency, self.view.current_steering_angle, self.configurations)
-        self.array_visualize(num_elements, spacing, curvature)
+        self.array_visualize(self.model.array_position_blocks())
         self.apply_configurations_to_visualization()
 
-    def array_visualize(self, num_elements, spacing, curvature_degrees):
-        curvature_degrees = max(0, min(curvature_degrees, 180))
-        a = curvature_degrees / 10.0
-        center_index = (num_elements - 1) / 2.0
-        x_coords = [(i - center_index) * spacing for i in range(num_elements)]
-        y_coords = [a * (x ** 2) for x in x_coords]
+    def array_visualize(self, position_blocks):
+        # Plot the same (N, 2) element positions the simulator uses, one block per array
+        positions = np.concatenate(position_blocks) if position_blocks else np.zeros((1, 2))
         self.view.arrayShapeItem.clear()
         self.view.arrayShapeItem.plot(
-            x_coords,
-            y_coords,
+            positions[:, 0],
+            positions[:, 1],
             pen=None,
             symbol='o',
             symbolSize=10,
             symbolBrush='w'
         )
-        x_min, x_max = min(x_coords), max(x_coords)
-        y_min, y_max = min(y_coords), max(y_coords)
-        x_padding = spacing * 0.5
+        x_min, x_max = positions[:, 0].min(), positions[:, 0].max()
+        y_min, y_max = positions[:, 1].min(), positions[:, 1].max()
+        x_range = x_max - x_min
+        x_padding = x_range * 0.05 if x_range > 0 else 1
         y_range = y_max - y_min
         y_padding = y_range * 0.5 if y_range > 0 else 1
         self.view.arrayShapeItem.setXRange(x_min - x_padding, x_max + x_padding, padding=0)
@@ -150,6 +212,11 @@ class MainController:
         self.view.arrayShapeItem.showGrid(x=True, y=True, alpha=0.3)
 
     def update_and_refresh_arrays_info(self):
+        self.mark_dirty('geometry')
+
+    def refresh_arrays_geometry(self):
+        self.view.updateVisualization()
+
         # Clear the existing configurations to ensure no outdated data is kept
         self.configurations.clear()
 
@@ -158,45 +225,125 @@ class MainController:
             try:
                 # Retrieve the configuration for each array
                 spacing, num_elements, curvature = self.view.visualization_widget.get_array_configuration(i)
+                offset, rotation = self.view.visualization_widget.get_array_placement(i)
                 # Append a new dictionary to the configurations list with the retrieved settings
                 self.configurations.append({
                     'num_elements': num_elements,
                     'spacing': spacing,
-                    'curvature': curvature
+                    'curvature': curvature,
+                    'offset': offset,
+                    'rotation': rotation
                 })
             except IndexError:
                 # Handle cases where the index is out of range, potentially logging or adding default configurations
-                self.logging.log(f"Failed to retrieve configuration for array {i}, using default settings.")
+                self.logging.log("Failed to retrieve configuration for array %d, using default settings.", i)
                 self.configurations.append({
                     'num_elements': 64,  # Default value if out of range
                     'spacing': 0.05,  # Default value if out of range
                     'curvature': 0  # Default value if out of range
                 })
-        spacing, num_elements, curvature = self.view.visualization_widget.get_array_configuration(1)
-        self.array_visualize(num_elements, self.view.elements_spacing_slider.value(), curvature)
-
-        # Optionally update visualization widget here if necessary
-        self.apply_configurations_to_visualization()
-
-    def apply_configurations_to_visualization(self):
-        # Assuming self.model is an instance of BeamformingSimulator
-        x_range = (-10, 10)
-        y_range = (0, 10)
-        x, y, intensity = self.model.simulate_multiple_arrays(x_range, y_range)
-
-        angles = np.linspace(-90, 90, 500)  # Angles to compute beam profile (in degrees)
-        array_factor = self.model.calculate_array_factor(angles)
+        self.array_visualize(self.model.array_position_blocks())
+
+    def apply_configurations_to_visualization(self, preview=None):
+        self.mark_dirty('field', preview)
+
+    def mark_dirty(self, stage, preview=None):
+        """
+        Mark a stage and every stage downstream of it dirty, and schedule the recompute.
+
+        Every change within one frame interval (or one transaction) collapses into a single refresh;
+        a full-resolution request wins over previews scheduled in the same frame.
+        """
+        # Coarse grid while a slider is being dragged, full resolution otherwise
+        if preview is None:
+            preview = self.is_slider_dragging()
+        self.dirty_stages.update(self.STAGES[self.STAGES.index(stage):])
+        if self.pending_preview is None:
+            self.pending_preview = preview
+            self.pending_since = time.perf_counter()
+        else:
+            self.pending_preview = self.pending_preview and preview
+        if self.transaction_depth == 0 and not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    @contextmanager
+    def transaction(self):
+        """Batch parameter changes; dirty stages are recomputed once, when the outermost transaction ends."""
+        self.transaction_depth += 1
+        try:
+            yield
+        finally:
+            self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.frame_timer.stop()
+            self.refresh_dirty_stages()
+
+    def refresh_dirty_stages(self):
+        dirty, self.dirty_stages = self.dirty_stages, set()
+        preview, self.pending_preview = self.pending_preview, None
+        if 'geometry' in dirty:
+            with self.performance.span('geometry'):
+                self.refresh_arrays_geometry()
+        if 'field' in dirty:
+            resolution = self.preview_resolution if preview else self.full_resolution
+            # Snapshot the parameters so the GUI can keep editing while the worker computes
+            with self.performance.span('apply_configurations'):
+                self.submit_simulation(preview, resolution, self.pending_since)
+
+    def submit_simulation(self, preview, resolution, requested_at=None):
+        request = {
+            'frequency': self.model.frequency,
+            'steering_angle': self.model.steering_angle,
+            'arrays_info': [dict(array_info) for array_info in self.model.arrays_info],
+            'x_range': self.view_x_range,
+            'y_range': self.view_y_range,
+            'resolution': resolution,
+            'precision': self.preview_precision if preview else self.full_precision,
+            'field_model': self.preview_field_model if preview else self.full_field_model,
+            'preview': preview,
+            'angles': np.linspace(-90, 90, 500),  # Angles to compute beam profile (in degrees)
+            'submitted_at': requested_at if requested_at is not None else time.perf_counter()
+        }
 
+        # Skip requests identical to the last one submitted (e.g. a slider released where it was pressed)
+        parameters = {name: value for name, value in request.items() if name not in ('angles', 'submitted_at')}
+        if parameters == self.last_submitted_parameters:
+            self.performance.increment('deduplicated_requests')
+            return
+        self.last_submitted_parameters = parameters
+        self.simulation_worker.submit(request)
+
+    def display_simulation_result(self, result):
+        with self.performance.span('render'):
+            self.render_simulation_result(result)
+
+        # Parameter change to pixels on screen, including time spent queued behind the worker
+        latency_ms = (time.perf_counter() - result['request']['submitted_at']) * 1e3
+        self.performance.record('latency', latency_ms)
+        if latency_ms > self.performance.frame_budget_ms:
+            self.performance.increment('over_budget_frames')
+        if self.performance_overlay_enabled:
+            self.update_performance_overlay()
+
+    def simulation_failed(self, request):
+        # Let the same parameters be submitted again instead of being deduplicated against the failed request
+        self.last_submitted_parameters = None
+
+    def render_simulation_result(self, result):
+        x, y, intensity = result['x'], result['y'], result['intensity']
+        angles, array_factor = result['angles'], result['array_factor']
         # Clear previous plots
         self.view.intensityImageItem.clear()
         self.view.beamProfileLine.clear()
 
-        # Plot intensity heatmap on the intensityMapItem
-        self.view.intensityImageItem.setImage(intensity.T)  # Transpose intensity for correct orientation
-        self.view.intensityImageItem.setLevels([np.min(intensity), np.max(intensity)])  # Color scaling
+        # Plot intensity heatmap on the intensityMapItem, placed in field coordinates
+        with self.performance.span('set_image'):
+            self.view.intensityImageItem.setImage(intensity.T)  # Transpose intensity for correct orientation
+            self.view.intensityImageItem.setLevels([np.min(intensity), np.max(intensity)])  # Color scaling
+            self.view.intensityImageItem.setRect(QtCore.QRectF(x[0], y[0], x[-1] - x[0], y[-1] - y[0]))
         self.view.intensityMapItem.getViewBox().setRange(
-            xRange=(0, 200),
-            yRange=(0, 200),
+            xRange=self.view_x_range,
+            yRange=self.view_y_range,
             padding=0
         )
         self.view.intensityMapItem.setTitle("Intensity Map")
@@ -204,11 +351,54 @@ class MainController:
         self.view.intensityMapItem.getAxis('bottom').setLabel("X-axis")
 
         # Plot beam profile on the beamProfileItem
-        self.view.beamProfileLine.setData(angles, array_factor)
+        with self.performance.span('set_data'):
+            self.view.beamProfileLine.setData(angles, array_factor)
         self.view.beamProfileItem.setTitle("Beam Profile")
         self.view.beamProfileItem.getAxis('left').setLabel("Array Factor")
         self.view.beamProfileItem.getAxis('bottom').setLabel("Angle (°)")
 
+    def toggle_performance_overlay(self):
+        self.performance_overlay_enabled = not self.performance_overlay_enabled
+        if not self.performance_overlay_enabled:
+            self.view.performance_overlay.hide()
+            self.logging.log("Performance summary: %s", self.performance.summary())
+        else:
+            self.update_performance_overlay()
+            self.view.performance_overlay.show()
+            self.view.performance_overlay.raise_()
+
+    def update_performance_overlay(self):
+        self.view.updatePerformanceOverlay(
+            compute_ms=self.performance.last('compute'),
+            render_ms=self.performance.last('render'),
+            dropped_frames=self.performance.counter('dropped_frames'),
+            over_budget_frames=self.performance.counter('over_budget_frames')
+        )
+
+    def is_slider_dragging(self):
+        return self.view.steering_angle_slider.isSliderDown() or self.view.elements_spacing_slider.isSliderDown()
+
+    def render_full_resolution(self):
+        self.apply_configurations_to_visualization(preview=False)
+
+    def set_intensity_region(self, x_range, y_range, preview=False):
+        # Clip the requested window to the simulated field so only visible pixels are computed
+        x_min, x_max = max(x_range[0], self.field_x_range[0]), min(x_range[1], self.field_x_range[1])
+        y_min, y_max = max(y_range[0], self.field_y_range[0]), min(y_range[1], self.field_y_range[1])
+        if x_min >= x_max or y_min >= y_max:
+            return
+        self.view_x_range = (x_min, x_max)
+        self.view_y_range = (y_min, y_max)
+        self.apply_configurations_to_visualization(preview=preview)
+
+    def reset_intensity_region(self):
+        self.set_intensity_region(self.field_x_range, self.field_y_range)
+
+    def update_intensity_region(self):
+        x_range, y_range = self.view.intensityMapItem.getViewBox().viewRange()
+        self.set_intensity_region(tuple(x_range), tuple(y_range), preview=True)
+        self.full_resolution_timer.start()
+
     # --------------------------------------------------------------------------------------------------------------------------------------
 
     def update_current_arrays_number(self):
@@ -218,11 +408,11 @@ class MainController:
         self.view.current_selected_ALL_array = True
         self.view.current_selected_array_button.setText("All Arrays")
         self.view.visualization_widget.updateArrayNumber(self.view.current_arrays_number)
+        self.update_and_refresh_arrays_info()
 
     def update_current_elements_number(self):
         self.view.current_elements_number = self.view.elements_number_SpinBox.value()
         self.view.arrays_parameters_indicator.setText(f"{self.view.current_elements_number} Elements")
-        self.view.updateVisualization()
         self.update_and_refresh_arrays_info()
 
     def update_elements_space_label(self):
@@ -233,7 +423,6 @@ class MainController:
             self.view.current_elements_spacing = (self.view.elements_spacing_slider.value() / 100) * self.model.wavelength
         else:
             self.view.current_elements_spacing = 0  # or some default value, or raise an error/message to the user
-        self.view.updateVisualization()
         self.update_and_refresh_arrays_info()
 
     def update_elements_curvature_label(self):
@@ -242,7 +431,6 @@ class MainController:
     def update_elements_curvature(self):
         self.view.current_array_curvature_angle = self.view.array_curve_slider.value()
         self.update_elements_curvature_label()
-        self.view.updateVisualization()
         self.update_and_refresh_arrays_info()
 
     def update_steering_angle(self):
@@ -270,12 +458,11 @@ class MainController:
         formatted_frequency = self.view.format_frequency(self.view.current_operating_frequency)
         self.view.sidebar_parameter_indicator.setText(formatted_frequency)
         self.model.update_operating_frequency(self.view.current_operating_frequency)
-        self.update_elements_spacing()
-        self.apply_configurations_to_visualization()
+        self.update_elements_spacing()  # Marks the geometry, and with it the field, dirty
 
     # --------------------------------------------------------------------------------------------------------------------------------------
     def close_application(self):
-        self.logging.log(f"Application Closed")
+        self.logging.log("Application Closed")
         self.main_window.close()
 
     def run(self):
@@ -0,0 +1,130 @@
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:  # Optional: pip install numexpr
+    numexpr = None
+
+try:
+    import numba
+except ImportError:  # Optional: pip install numba
+    numba = None
+
+BACKENDS = ('numpy', 'numexpr', 'numba')
+
+
+def available_backends():
+    """Return the field backends whose packages are installed, in ``BACKENDS`` order."""
+    installed = {'numpy': True, 'numexpr': numexpr is not None, 'numba': numba is not None}
+    return tuple(name for name in BACKENDS if installed[name])
+
+
+def resolve_backend(backend, precision='double'):
+    """
+    Return the backend to run for a requested name and compute precision.
+
+    'auto' picks numba for float64 work when it is installed and NumPy otherwise: the compiled
+    kernels always compute in float64, so they lose to NumPy's single and mixed precision, and
+    numexpr's per-element passes are slower than the chunked NumPy engine. A known backend whose
+    package is missing falls back to 'numpy', so a configuration written on one machine still
+    runs on another.
+    """
+    available = available_backends()
+    if backend == 'auto':
+        return 'numba' if precision == 'double' and 'numba' in available else 'numpy'
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend must be one of auto, {', '.join(BACKENDS)}")
+    return backend if backend in available else 'numpy'
+
+
+def field_kernel(backend):
+    """Return the fused field kernel of a compiled backend (see ``numexpr_field`` for its signature)."""
+    return {'numexpr': numexpr_field, 'numba': numba_field}[backend]
+
+
+def set_backend_threads(backend, threads):
+    """Limit a compiled backend to ``threads`` threads (numba never exceeds the threads it started with)."""
+    if backend == 'numexpr':
+        numexpr.set_num_threads(threads)
+    elif backend == 'numba':
+        numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+
+
+def numexpr_field(x, y, positions, phase_shifts, amplitudes, k, exponent, min_distance):
+    """
+    Sum the complex field of all elements over the (y, x) grid with numexpr.
+
+    Each element is one multi-threaded numexpr pass that evaluates the distance, the phase, the
+    spreading loss and exp(1j * phase) per pixel and adds it into the field, without full-grid
+    temporaries.
+
+    Args:
+        x (numpy.ndarray): x-coordinates of the grid columns.
+        y (numpy.ndarray): y-coordinates of the grid rows.
+        positions (numpy.ndarray): (M, 2) element coordinates.
+        phase_shifts (numpy.ndarray): (M,) phase shift applied to each element.
+        amplitudes (numpy.ndarray): (M,) amplitude of each element; None for unit amplitudes.
+        k (float): Wave number.
+        exponent (float): Spreading loss exponent; the amplitude decays as distance ** -exponent.
+        min_distance (float): Distance below which the spreading loss is clamped.
+
+    Returns:
+        field_real (numpy.ndarray): float64 (len(y), len(x)) real part of the field.
+        field_imag (numpy.ndarray): float64 (len(y), len(x)) imaginary part of the field.
+    """
+    field = np.zeros((len(y), len(x)), dtype=np.complex128)
+    # Squared offsets are separable: one row and one column per element
+    dx2 = (np.asarray(x, dtype=np.float64)[None, :] - positions[:, 0, None]) ** 2
+    dy2 = (np.asarray(y, dtype=np.float64)[None, :] - positions[:, 1, None]) ** 2
+
+    expression = "field + amplitude * exp(1j * (k * sqrt(dy2 + dx2) + phase))"
+    if exponent:
+        # (max(r, r0)) ** -exponent, written on squared distances so r is not taken twice
+        expression += " * where(dy2 + dx2 < floor2, floor2, dy2 + dx2) ** power"
+    variables = {'field': field, 'k': float(k), 'floor2': float(min_distance) ** 2, 'power': -exponent / 2}
+    for element in range(len(positions)):
+        variables['dx2'] = dx2[element, None, :]
+        variables['dy2'] = dy2[element, :, None]
+        variables['phase'] = float(phase_shifts[element])
+        variables['amplitude'] = 1.0 if amplitudes is None else float(amplitudes[element])
+        numexpr.evaluate(expression, local_dict=variables, out=field)
+    return field.real, field.imag
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _numba_field_kernel(x, y, positions, phase_shifts, amplitudes, k, exponent, min_distance, field_real, field_imag):
+        # One pass per pixel over the elements; rows are spread across the numba threads
+        for row in numba.prange(len(y)):
+            for column in range(len(x)):
+                real = 0.0
+                imag = 0.0
+                for element in range(len(positions)):
+                    dx = x[column] - positions[element, 0]
+                    dy = y[row] - positions[element, 1]
+                    distance = np.sqrt(dx * dx + dy * dy)
+                    phase = k * distance + phase_shifts[element]
+                    weight = amplitudes[element]
+                    if exponent != 0.0:
+                        weight *= max(distance, min_distance) ** -exponent
+                    real += weight * np.cos(phase)
+                    imag += weight * np.sin(phase)
+                field_real[row, column] = real
+                field_imag[row, column] = imag
+
+
+def numba_field(x, y, positions, phase_shifts, amplitudes, k, exponent, min_distance):
+    """
+    Sum the complex field of all elements over the (y, x) grid with a compiled numba kernel.
+
+    The kernel fuses the distance, phase, spreading loss and trigonometry in one pass over the grid
+    and runs the rows in parallel. Arguments and returns match ``numexpr_field``; the first call
+    compiles the kernel (cached on disk afterwards).
+    """
+    field_real = np.empty((len(y), len(x)))
+    field_imag = np.empty((len(y), len(x)))
+    amplitudes = np.ones(len(positions)) if amplitudes is None else np.ascontiguousarray(amplitudes, dtype=np.float64)
+    _numba_field_kernel(np.ascontiguousarray(x, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64),
+                        np.ascontiguousarray(positions, dtype=np.float64), np.ascontiguousarray(phase_shifts, dtype=np.float64),
+                        amplitudes, float(k), float(exponent), float(min_distance), field_real, field_imag)
+    return field_real, field_imag
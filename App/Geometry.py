@@ -0,0 +1,156 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+
+LAYOUTS = ('linear', 'arc', 'parabolic', 'circular', 'random', 'imported')
+ARRAY_SEPARATION = 2.0  # Distance in metres between neighbouring arrays placed by array_offsets
+
+
+def linear_positions(num_elements, spacing):
+    """Elements along x, ``spacing`` apart and centered on the origin."""
+    x = (np.arange(num_elements, dtype=np.float64) - (num_elements - 1) / 2) * spacing
+    return np.column_stack((x, np.zeros(num_elements)))
+
+
+def arc_positions(num_elements, spacing, curvature_degree):
+    """
+    Elements evenly spread along a circular arc of length (N - 1) * spacing subtending ``curvature_degree``.
+
+    The arc bends away from +x so that its midpoint sits at the origin; a zero curvature is a linear array.
+    """
+    if curvature_degree == 0 or num_elements < 2:
+        return linear_positions(num_elements, spacing)
+
+    # Calculate the radius of the arc
+    curvature_radians = np.radians(curvature_degree)
+    radius = (num_elements - 1) * spacing / curvature_radians
+
+    # Distribute elements evenly along the arc
+    angles = np.linspace(-curvature_radians / 2, curvature_radians / 2, num_elements)
+    return np.column_stack((radius * np.cos(angles) - radius, radius * np.sin(angles)))
+
+
+def parabolic_positions(num_elements, spacing, curvature_degree):
+    """Elements ``spacing`` apart along x on the parabola y = (curvature_degree / 10) * x**2."""
+    positions = linear_positions(num_elements, spacing)
+    positions[:, 1] = curvature_degree / 10.0 * positions[:, 0] ** 2
+    return positions
+
+
+def circular_positions(num_elements, spacing):
+    """Elements evenly spread around a full circle of circumference N * spacing, centered on the origin."""
+    radius = num_elements * spacing / (2 * np.pi)
+    angles = 2 * np.pi * np.arange(num_elements) / num_elements
+    return np.column_stack((radius * np.cos(angles), radius * np.sin(angles)))
+
+
+def random_positions(num_elements, spacing, fill_factor=0.5, seed=0):
+    """
+    Sparse (thinned) linear array: ``num_elements`` slots drawn at random from a centered grid of
+    ceil(N / fill_factor) slots ``spacing`` apart. The same seed always gives the same layout.
+    """
+    if not 0 < fill_factor <= 1:
+        raise ValueError("Fill factor must be in (0, 1]")
+    slots = int(np.ceil(num_elements / fill_factor))
+    chosen = np.sort(np.random.default_rng(seed).choice(slots, size=num_elements, replace=False))
+    x = (chosen - (slots - 1) / 2) * spacing
+    return np.column_stack((x, np.zeros(num_elements)))
+
+
+def load_positions(path):
+    """
+    Import element coordinates from a ``.npy`` file or a CSV file of x, y columns (one header row allowed).
+
+    Returns:
+        positions (numpy.ndarray): (N, 2) float64 element coordinates in metres.
+    """
+    if os.path.splitext(path)[1].lower() == '.npy':
+        positions = np.load(path)
+    else:
+        try:
+            positions = np.loadtxt(path, delimiter=',', ndmin=2)
+        except ValueError:
+            positions = np.loadtxt(path, delimiter=',', ndmin=2, skiprows=1)
+    return as_positions(positions)
+
+
+def as_positions(positions):
+    """Validate custom coordinates and return them as an (N, 2) float64 array."""
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.ndim != 2 or positions.shape[1] < 2 or len(positions) == 0:
+        raise ValueError(f"Element coordinates must be an (N, 2) array of x, y values, got shape {positions.shape}")
+    return np.ascontiguousarray(positions[:, :2])
+
+
+@lru_cache(maxsize=256)
+def cached_layout(layout, num_elements, spacing, curvature_degree, options=()):
+    """
+    Return the read-only (N, 2) element positions of a generated layout, memoized by its parameters.
+
+    ``options`` holds extra (name, value) pairs, e.g. the fill factor and seed of random layouts.
+    """
+    options = dict(options)
+    if layout == 'linear':
+        positions = linear_positions(num_elements, spacing)
+    elif layout == 'arc':
+        positions = arc_positions(num_elements, spacing, curvature_degree)
+    elif layout == 'parabolic':
+        positions = parabolic_positions(num_elements, spacing, curvature_degree)
+    elif layout == 'circular':
+        positions = circular_positions(num_elements, spacing)
+    elif layout == 'random':
+        positions = random_positions(num_elements, spacing, **options)
+    else:
+        raise ValueError(f"Layout must be one of {', '.join(LAYOUTS)}")
+    positions.setflags(write=False)  # Shared between callers through the cache
+    return positions
+
+
+def place_positions(positions, offset=(0, 0), rotation=0):
+    """Rotate (N, 2) element positions by ``rotation`` degrees about the origin, then translate them by ``offset``."""
+    if rotation:
+        angle = np.radians(rotation)
+        cos, sin = np.cos(angle), np.sin(angle)
+        positions = positions @ np.array([[cos, sin], [-sin, cos]])
+    if offset[0] or offset[1]:
+        positions = positions + np.asarray(offset, dtype=np.float64)
+    return positions
+
+
+def array_offsets(arrays_number, separation=ARRAY_SEPARATION):
+    """Offsets that place ``arrays_number`` arrays side by side along x, ``separation`` apart and centered on the origin."""
+    return [((index - (arrays_number - 1) / 2) * separation, 0.0) for index in range(arrays_number)]
+
+
+@lru_cache(maxsize=32)
+def _cached_import(path, modified):
+    positions = load_positions(path)
+    positions.setflags(write=False)
+    return positions
+
+
+def array_positions(array_info):
+    """
+    Return the (N, 2) element positions described by an ``arrays_info`` entry.
+
+    The entry's ``layout`` picks the generator; without one, a zero curvature is a linear array and
+    any other curvature an arc. 'imported' layouts take ``positions``: an (N, 2) array or the path of
+    a CSV or ``.npy`` file (re-read when the file changes). 'random' layouts read optional
+    ``fill_factor`` and ``seed`` entries.
+
+    The layout is then rotated by the entry's ``rotation`` (degrees, counterclockwise about the
+    array's own origin) and moved to its ``offset`` (x, y in metres); both default to zero.
+    """
+    layout = array_info.get('layout') or ('linear' if array_info.get('curvature', 0) == 0 else 'arc')
+    if layout == 'imported':
+        source = array_info['positions']
+        if isinstance(source, (str, os.PathLike)):
+            positions = _cached_import(os.fspath(source), os.path.getmtime(source))
+        else:
+            positions = as_positions(source)
+    else:
+        options = tuple((name, array_info[name]) for name in ('fill_factor', 'seed') if name in array_info) if layout == 'random' else ()
+        positions = cached_layout(layout, int(array_info['num_elements']), float(array_info['spacing']),
+                                  float(array_info.get('curvature', 0)), options)
+    return place_positions(positions, array_info.get('offset', (0, 0)), array_info.get('rotation', 0))
@@ -1,40 +1,162 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes records in batches, rotating by size and by age.
+
+    The age is that of the log file, not of the handler: the time each file was started is kept
+    next to it in ``<log file>.started``, so sessions shorter than ``rotate_interval`` still rotate.
+    """
+
+    def __init__(self, filename, max_bytes, backup_count, rotate_interval):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self.rotate_interval = rotate_interval  # Seconds before the log is rotated regardless of size (0 disables)
+        self.started_path = self.baseFilename + ".started"
+        self.started_at = self._read_started_at()
+
+    def _read_started_at(self):
+        try:
+            with open(self.started_path) as started_file:
+                return float(started_file.read())
+        except (OSError, ValueError):
+            # No record yet (new or older log file): count its age from now
+            return self._mark_started()
+
+    def _mark_started(self):
+        self.started_at = time.time()
+        try:
+            with open(self.started_path, "w") as started_file:
+                started_file.write(repr(self.started_at))
+        except OSError:
+            pass  # Rotation by age then only spans this session
+        return self.started_at
+
+    def _open(self):
+        new_file = not os.path.exists(self.baseFilename) or os.path.getsize(self.baseFilename) == 0
+        stream = super()._open()
+        if new_file:
+            self._mark_started()
+        return stream
+
+    def shouldRollover(self, record):
+        if (self.rotate_interval and time.time() - self.started_at >= self.rotate_interval
+                and os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0):
+            return True
+        return super().shouldRollover(record)
+
+    def write_batch(self, records):
+        """Format and write a batch of records, then flush the file once."""
+        self.acquire()
+        try:
+            for record in records:
+                try:
+                    if self.shouldRollover(record):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(self.format(record) + self.terminator)
+                except Exception:
+                    self.handleError(record)
+            if self.stream is not None:
+                self.stream.flush()
+        finally:
+            self.release()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Leave message formatting to the writer thread
+        return record
 
 
 class LoggingManager:
-    def __init__(self, log_file="Simulation.log"):
-        """Initialize logging configuration."""
+    _STOP = object()
+
+    def __init__(self, log_file="Simulation.log", max_bytes=5 * 1024 ** 2, backup_count=5, rotate_interval=24 * 60 * 60,
+                 batch_size=256, flush_interval=0.5, level=logging.INFO):
+        """
+        Initialize logging configuration.
+
+        Records are put on a queue by the calling thread and written by a background thread in
+        batches of up to ``batch_size`` records or every ``flush_interval`` seconds, so disk I/O
+        never runs on the GUI thread. Messages use %-style arguments that are only formatted by
+        the writer, and levels below ``level`` are discarded before a record is even created.
+        The log rotates once it reaches ``max_bytes`` or is ``rotate_interval`` seconds old.
+        """
         log_directory = "Logging"
         if not os.path.exists(log_directory):
             os.makedirs(log_directory)  # Create the Logging directory if it does not exist
 
         log_path = os.path.join(log_directory, log_file)
         self.log_file = log_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.handler = BatchedRotatingFileHandler(self.log_file, max_bytes, backup_count, rotate_interval)
+        self.handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+        self.queue = queue.SimpleQueue()
+        self.logger = logging.getLogger(f"BeamformingSimulator.{log_file}")
+        self.logger.setLevel(level)  # Log levels: DEBUG, INFO, WARNING, ERROR, CRITICAL
+        self.logger.propagate = False
+        self.logger.handlers = [_DeferredQueueHandler(self.queue)]
 
-        logging.basicConfig(
-            filename=self.log_file,
-            level=logging.INFO,  # Log levels: DEBUG, INFO, WARNING, ERROR, CRITICAL
-            format="%(asctime)s - %(levelname)s - %(message)s"
-        )
+        self.writer = threading.Thread(target=self._write_batches, name="LoggingWriter", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
 
-    def log(self, message, level='info'):
+    def log(self, message, *args, level='info'):
         """General log method that logs messages based on the level specified."""
         {
-            'info': logging.info,
-            'error': logging.error,
-            'warning': logging.warning,
-            'debug': logging.debug
-        }[level](message)
+            'info': self.logger.info,
+            'error': self.logger.error,
+            'warning': self.logger.warning,
+            'debug': self.logger.debug
+        }[level](message, *args)
+
+    def log_action(self, message, *args):
+        self.logger.info(message, *args)
+
+    def log_error(self, message, *args):
+        self.logger.error(message, *args)
+
+    def log_warning(self, message, *args):
+        self.logger.warning(message, *args)
+
+    def log_debug(self, message, *args):
+        self.logger.debug(message, *args)
 
-    def log_action(self, message):
-        logging.info(message)
+    def is_enabled(self, level):
+        return self.logger.isEnabledFor(level)
 
-    def log_error(self, message):
-        logging.error(message)
+    def close(self):
+        """Write out everything still queued and stop the writer thread."""
+        if self.writer.is_alive():
+            self.queue.put(self._STOP)
+            self.writer.join(timeout=5)
+        self.handler.close()
 
-    def log_warning(self, message):
-        logging.warning(message)
+    def _write_batches(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
 
-    def log_debug(self, message):
-        logging.debug(message)
+            stopping = batch[-1] is self._STOP
+            self.handler.write_batch([record for record in batch if record is not self._STOP])
+            if stopping:
+                return
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Upper edges of the latency histogram buckets in milliseconds; the last bucket is open-ended
+HISTOGRAM_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class PerformanceMonitor:
+    """
+    Thread-safe timing spans with per-stage latency histograms.
+
+    Stages are named freely (e.g. "simulate", "set_image"). Each stage keeps a histogram of
+    every recorded duration and a window of the most recent ones for percentiles. When a
+    ``logger`` (LoggingManager) is given, every span is also logged at debug level.
+    """
+
+    def __init__(self, logger=None, window=512, frame_budget_ms=1000 / 30):
+        self.logger = logger
+        self.window = window
+        self.frame_budget_ms = frame_budget_ms  # Frames whose render and compute exceed this count as over budget
+        self._lock = threading.Lock()
+        self._recent = {}
+        self._histograms = {}
+        self._counters = {}
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - started) * 1e3)
+
+    def record(self, stage, milliseconds):
+        with self._lock:
+            if stage not in self._recent:
+                self._recent[stage] = deque(maxlen=self.window)
+                self._histograms[stage] = [0] * (len(HISTOGRAM_EDGES_MS) + 1)
+            self._recent[stage].append(milliseconds)
+            self._histograms[stage][int(np.searchsorted(HISTOGRAM_EDGES_MS, milliseconds))] += 1
+        if self.logger is not None:
+            self.logger.log_debug("span stage=%s ms=%.3f", stage, milliseconds)
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def counter(self, counter):
+        with self._lock:
+            return self._counters.get(counter, 0)
+
+    def last(self, stage):
+        """Return the most recent duration of a stage in milliseconds, or None."""
+        with self._lock:
+            recent = self._recent.get(stage)
+            return recent[-1] if recent else None
+
+    def histogram(self, stage):
+        """Return (bucket upper edges in ms, counts); the final count is for durations above the last edge."""
+        with self._lock:
+            return HISTOGRAM_EDGES_MS, list(self._histograms.get(stage, [0] * (len(HISTOGRAM_EDGES_MS) + 1)))
+
+    def summary(self):
+        """
+        Returns:
+            summary (dict): Stage -> count, mean, p50, p95 and max over the recent window (ms),
+                plus the full histogram counts.
+        """
+        with self._lock:
+            stages = {stage: (np.array(recent), list(self._histograms[stage])) for stage, recent in self._recent.items()}
+
+        return {stage: {
+            'count': int(sum(histogram)),
+            'mean': float(recent.mean()),
+            'p50': float(np.percentile(recent, 50)),
+            'p95': float(np.percentile(recent, 95)),
+            'max': float(recent.max()),
+            'histogram': histogram
+        } for stage, (recent, histogram) in stages.items()}
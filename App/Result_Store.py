@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+
+def _json_value(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, complex):
+        return [value.real, value.imag]
+    raise TypeError(f"Cannot serialize configuration value of type {type(value).__name__}")
+
+
+class ResultStore:
+    """
+    On-disk cache of simulation results keyed by a hash of their configuration.
+
+    Every array of a result is saved as its own ``.npy`` file under ``<directory>/<key>/`` and
+    loaded back memory-mapped, so reopening a stored configuration is a zero-copy load
+    instead of a recompute. ``index.json`` records each entry's configuration, size and last
+    access; least recently used entries are evicted once the store exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory="Results", max_bytes=1024 ** 3):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        if not os.path.exists(directory):
+            os.makedirs(directory)  # Create the Results directory if it does not exist
+        self.index = self._load_index()
+
+    @staticmethod
+    def key(configuration):
+        """Return a stable hash of a configuration dict (NumPy arrays and scalars allowed)."""
+        description = json.dumps(configuration, sort_keys=True, default=_json_value)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def get(self, configuration):
+        """
+        Return the stored result of a configuration as read-only memory-mapped arrays, or None.
+        """
+        key = self.key(configuration)
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+
+        try:
+            result = {name: np.load(os.path.join(self.directory, key, f"{name}.npy"), mmap_mode='r') for name in entry['arrays']}
+        except (OSError, ValueError):
+            self._remove(key)  # Files deleted or truncated behind our back
+            self._save_index()
+            return None
+
+        entry['last_access'] = time.time()
+        self._save_index()
+        return result
+
+    def put(self, configuration, result):
+        """
+        Store the NumPy arrays of a result dict under the configuration's key.
+
+        Non-array values are not stored. Least recently used entries are evicted afterwards
+        until the store fits in ``max_bytes``.
+        """
+        key = self.key(configuration)
+        entry_directory = os.path.join(self.directory, key)
+        os.makedirs(entry_directory, exist_ok=True)
+
+        arrays = {name: value for name, value in result.items() if isinstance(value, np.ndarray)}
+        for name, value in arrays.items():
+            np.save(os.path.join(entry_directory, f"{name}.npy"), value)
+
+        self.index[key] = {
+            'configuration': json.loads(json.dumps(configuration, default=_json_value)),
+            'arrays': list(arrays),
+            'bytes': sum(value.nbytes for value in arrays.values()),
+            'last_access': time.time()
+        }
+        self.evict(keep=key)
+        self._save_index()
+        return key
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the total size is within ``max_bytes``."""
+        for key in sorted(self.index, key=lambda entry_key: self.index[entry_key]['last_access']):
+            if self.total_bytes() <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.index.values())
+
+    def clear(self):
+        for key in list(self.index):
+            self._remove(key)
+        self._save_index()
+
+    def _remove(self, key):
+        self.index.pop(key, None)
+        shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as index_file:
+                return json.load(index_file)
+        except ValueError:
+            return {}  # A corrupt index only costs recomputation
+
+    def _save_index(self):
+        # Write to a temporary file first so an interrupted save never leaves a half-written index
+        temporary_path = self.index_path + ".tmp"
+        with open(temporary_path, "w") as index_file:
+            json.dump(self.index, index_file)
+        os.replace(temporary_path, self.index_path)
@@ -1,76 +1,944 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LogNorm
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from math import sin, radians
 
+from App.Apodization import apodization_weights
+from App.Field_Backends import field_kernel, resolve_backend, set_backend_threads
+from App.Geometry import array_positions, cached_layout
+
 
 class BeamformingSimulator:
-    def __init__(self, frequency, steering_angle, arrays_info):
+    PRECISIONS = ('double', 'mixed', 'single')
+    FIELD_MODELS = ('exact', 'auto')
+    FFT_OVERSAMPLING = 256  # Zero-padding factor of the uniform linear array FFT
+    FAR_FIELD_TABLE_STEP = 0.05  # Largest element phase change between samples of the far-field array factor table (rad)
+    FIELD_BAND_ROWS = 16  # Grid rows per exactly evaluated block of a partial (near-field or contributing) region
+    SPREADING_EXPONENTS = {None: 0.0, 'cylindrical': 0.5, 'spherical': 1.0}  # Amplitude decays as distance ** -exponent
+    STEERING_MATRIX_CACHE_SIZE = 8  # Steering matrices kept for the batched taper evaluator
+    THREAD_MIN_WORK = 1 << 20  # Pixel-element products per thread below which the field engine does not shard
+
+    def __init__(self, frequency, steering_angle, arrays_info, scratch_buffer_bytes=32 * 1024 ** 2, resolution=(200, 200),
+                 phasor_cache_bytes=256 * 1024 ** 2, precision='double', field_cache_bytes=128 * 1024 ** 2, field_model='exact',
+                 far_field_tolerance=0.1, spreading=None, cull_tolerance=1e-3, backend='auto', threads=None):
         self.frequency = frequency  # Operating frequency in Hz
         self.steering_angle = steering_angle  # Steering angle in degrees
         self.arrays_info = arrays_info  # Store array configurations
         self.wavelength = 3e8 / self.frequency  # Calculate wavelength from frequency
         self.k = 2 * np.pi / self.wavelength  # Calculate wave number
+        self.scratch_buffer_bytes = scratch_buffer_bytes  # Upper bound on the field engine's temporary buffers
+        self.resolution = tuple(resolution)  # Default intensity grid size as (x points, y points)
+        self.phasor_cache_bytes = phasor_cache_bytes  # Memory limit of the steering-invariant phasor stacks (0 disables)
+        self._phasor_cache = OrderedDict()  # (precision, k, geometry, grid) -> (M, P) stack of exp(1j * k * r)
+        self.field_cache_bytes = field_cache_bytes  # Memory limit of the per-array field contributions (0 disables)
+        self._field_states = OrderedDict()  # (precision, grid) -> per-array contributions and their running sum
+        self._steering_matrices = OrderedDict()  # (k, geometry, steering, angles) -> (M, A) steering matrix
+        self.precision = None
+        self.backend = None  # Engine in use, resolved from ``requested_backend`` and the precision
+        self.requested_backend = None
+        self.update_precision(precision)
+        self.field_model = None
+        self.update_field_model(field_model)
+        self.far_field_tolerance = None  # Largest far-field error bound accepted per pixel (None: Fraunhofer distance only)
+        self.update_far_field_tolerance(far_field_tolerance)
+        self.spreading = None
+        self.update_spreading(spreading)
+        self.cull_tolerance = cull_tolerance  # Relative intensity below which an array's contribution is skipped (0 disables)
+        self.update_backend(backend)
+        self.threads = None
+        self._thread_pool = None  # Created on first use with ``threads`` workers
+        self.update_threads(threads)
 
-    def simulate_multiple_arrays(self, x_range, y_range):
+    def simulate_multiple_arrays(self, x_range, y_range, resolution=None):
         """
         Simulate multiple arrays with given configurations and return intensity map.
 
+        Only the requested window is evaluated, so a zoomed region of interest costs
+        no more than its own grid.
+
         Args:
             x_range (tuple): Range of x-coordinates (min, max).
             y_range (tuple): Range of y-coordinates (min, max).
+            resolution (tuple): Grid size (x points, y points); defaults to ``self.resolution``.
 
         Returns:
             x (numpy.ndarray): x-coordinate array.
             y (numpy.ndarray): y-coordinate array.
             intensity (numpy.ndarray): Normalized intensity map.
         """
-        x = np.linspace(x_range[0], x_range[1], 200)
-        y = np.linspace(y_range[0], y_range[1], 200)
-        X, Y = np.meshgrid(x, y)
-        intensity_map = np.zeros_like(X, dtype=np.complex128)
-
-        for array_info in self.arrays_info:
-            positions = self.calculate_element_positions(array_info['num_elements'], array_info['spacing'], array_info['curvature'])
-            one = -1 if array_info['curvature'] == 0 else 1
-            for (ex, ey) in positions:
-                distances = np.sqrt((X - ex) ** 2 + (Y - ey) ** 2)
-                phase_shift = -self.k * (ex * np.sin(one * np.radians(self.steering_angle)) + ey * np.cos(np.radians(self.steering_angle)))
-                intensity_map += np.exp(1j * (self.k * distances + phase_shift))
+        x_points, y_points = self.resolution if resolution is None else resolution
+        x = np.linspace(x_range[0], x_range[1], int(x_points))
+        y = np.linspace(y_range[0], y_range[1], int(y_points))
+        intensity_map = self.combined_field(x, y)
 
         intensity = np.abs(intensity_map) ** 2
         intensity /= np.max(intensity) + 1e-10  # Avoid division by zero
         return x, y, intensity
 
+    def stack_element_positions(self):
+        """
+        Stack the elements of every configured array into one coordinate block.
+
+        Returns:
+            positions (numpy.ndarray): (M, 2) element coordinates of all arrays.
+            phase_shifts (numpy.ndarray): (M,) steering plus weight phase of each element.
+            amplitudes (numpy.ndarray): (M,) weight magnitude of each element, or None if every array is uniform.
+        """
+        position_blocks = self.array_position_blocks()
+        excitations = [self.element_excitations(array_info, positions) for array_info, positions in zip(self.arrays_info, position_blocks)]
+
+        if not position_blocks:
+            return np.empty((0, 2)), np.empty(0), None
+        amplitudes = None
+        if any(block_amplitudes is not None for _, block_amplitudes in excitations):
+            amplitudes = np.concatenate([np.ones(len(positions)) if block_amplitudes is None else block_amplitudes
+                                         for (_, block_amplitudes), positions in zip(excitations, position_blocks)])
+        return np.concatenate(position_blocks), np.concatenate([phase_shifts for phase_shifts, _ in excitations]), amplitudes
+
+    def element_weights(self, array_info, num_elements=None):
+        """Return the (N,) complex apodization weights of one array (its ``weights`` entry), or None if uniform."""
+        return apodization_weights(array_info.get('weights'), int(array_info['num_elements'] if num_elements is None else num_elements))
+
+    def stack_element_weights(self):
+        """Return the (M,) complex weights of all arrays in ``stack_element_positions`` order, or None if every array is uniform."""
+        counts = [len(positions) for positions in self.array_position_blocks()]
+        blocks = [self.element_weights(array_info, count) for array_info, count in zip(self.arrays_info, counts)]
+        if all(weights is None for weights in blocks):
+            return None
+        return np.concatenate([np.ones(count, dtype=np.complex128) if weights is None else weights
+                               for count, weights in zip(counts, blocks)])
+
+    def element_excitations(self, array_info, positions, k=None):
+        """
+        Return the (N,) phase shifts and amplitudes driving one array: its steering phases plus the
+        phase of its weights, and the weight magnitudes (None for uniform unit weights).
+        """
+        phase_shifts = self.steering_phase_shifts(array_info, positions, k)
+        weights = self.element_weights(array_info, len(positions))
+        if weights is None:
+            return phase_shifts, None
+        return phase_shifts + np.angle(weights), np.abs(weights)
+
+    def steering_phase_shifts(self, array_info, positions, k=None):
+        """Return the (N,) steering phase shift of each element of one array (at wave number ``k``, default ``self.k``)."""
+        steering = np.radians(self.steering_angle)
+        one = -1 if array_info.get('curvature', 0) == 0 else 1
+        return -(self.k if k is None else k) * (positions[:, 0] * np.sin(one * steering) + positions[:, 1] * np.cos(steering))
+
+    def combined_field(self, x, y):
+        """
+        Return the complex field of all configured arrays over the (y, x) grid.
+
+        Each array's contribution is cached together with their running sum, keyed by the
+        array's geometry, wave number, steering phases and weights. When only some arrays change, their
+        old contributions are subtracted and the new ones added, so editing one array of eight
+        costs about an eighth of a full recompute. Identical arrays share one contribution. The
+        returned array is the cached sum and must not be modified.
+
+        Propagation phasor stacks are only cached when the stacks of every array being recomputed
+        fit in ``phasor_cache_bytes`` together; otherwise each stack would evict the previous
+        one before it could be reused, and the fields are streamed instead.
+        """
+        pixels = len(x) * len(y)
+        position_blocks = self.array_position_blocks()
+        if (len(self.arrays_info) + 1) * pixels * 16 > self.field_cache_bytes:
+            cache_phasors = self._phasor_stacks_fit(x, y, position_blocks)
+            field = np.zeros((len(y), len(x)), dtype=np.complex128)
+            for array_info, positions in zip(self.arrays_info, position_blocks):
+                field += self._array_field(x, y, positions, *self.element_excitations(array_info, positions), cache_phasors=cache_phasors)
+            return field
+
+        grid = (self.precision, self.field_model, self.far_field_tolerance, self.spreading, self.cull_tolerance,
+                np.asarray(x).tobytes(), np.asarray(y).tobytes())
+        state = self._field_states.pop(grid, None)
+        if state is None:
+            state = {'arrays': [], 'total': np.zeros((len(y), len(x)), dtype=np.complex128), 'updates': 0}
+        self._field_states[grid] = state
+
+        previous = state['arrays']
+        known = {key: contribution for key, contribution in previous}
+        arrays = []
+        for array_info, positions in zip(self.arrays_info, position_blocks):
+            phase_shifts, amplitudes = self.element_excitations(array_info, positions)
+            key = (self.k, positions.tobytes(), phase_shifts.tobytes(), None if amplitudes is None else amplitudes.tobytes())
+            arrays.append((key, positions, phase_shifts, amplitudes))
+        cache_phasors = self._phasor_stacks_fit(x, y, [positions for index, (key, positions, _, _) in enumerate(arrays)
+                                                       if key not in known and not (index < len(previous) and previous[index][0] == key)])
+
+        current = []
+        for index, (key, positions, phase_shifts, amplitudes) in enumerate(arrays):
+            if index < len(previous) and previous[index][0] == key:
+                current.append(previous[index])
+                continue
+
+            contribution = known.get(key)
+            if contribution is None:
+                contribution = self._array_field(x, y, positions, phase_shifts, amplitudes, cache_phasors)
+                known[key] = contribution
+            if index < len(previous):
+                state['total'] -= previous[index][1]
+            state['total'] += contribution
+            state['updates'] += 1
+            current.append((key, contribution))
+
+        for _, contribution in previous[len(current):]:
+            state['total'] -= contribution
+            state['updates'] += 1
+        state['arrays'] = current
+
+        # Re-sum from the contributions now and then so rounding from the updates cannot build up
+        if state['updates'] > 64 or not current:
+            state['total'][...] = 0
+            for _, contribution in current:
+                state['total'] += contribution
+            state['updates'] = 0
+
+        # Drop the least recently used grids beyond the memory limit
+        while len(self._field_states) > 1 and sum(
+                (len(cached['arrays']) + 1) * cached['total'].nbytes for cached in self._field_states.values()) > self.field_cache_bytes:
+            self._field_states.popitem(last=False)
+        return state['total']
+
+    def _array_field(self, x, y, positions, phase_shifts, amplitudes=None, cache_phasors=True):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        region = self._contributing_region(x, y, positions)
+        if self.field_model == 'auto':
+            return self._far_field_array_field(x, y, positions, phase_shifts, amplitudes, region, cache_phasors)
+        if region is None:
+            return self._exact_array_field(x, y, positions, phase_shifts, amplitudes, cache_phasors)
+        field = np.zeros((len(y), len(x)), dtype=np.complex128)
+        self._banded_field(x, y, positions, phase_shifts, amplitudes, region, field)
+        return field
+
+    def _contributing_region(self, x, y, positions):
+        """
+        Return the mask of the pixels where one array's contribution is not negligible, or None for all of them.
+
+        With a spreading loss, every element is at least R - D/2 away from a pixel at distance R from
+        the array center, so the array's amplitude there is at most sum(a) * (R - D/2) ** -exponent.
+        Pixels where that bound, squared, is below ``cull_tolerance`` times the same bound at
+        max(D/2, wavelength) from the center are skipped. Without spreading nothing is skipped.
+        """
+        exponent = self.SPREADING_EXPONENTS[self.spreading]
+        if not exponent or not self.cull_tolerance:
+            return None
+        center = positions.mean(axis=0)
+        radius = float(np.sqrt(((positions - center) ** 2).sum(axis=1)).max())
+        reach = radius + max(radius, self.wavelength) * self.cull_tolerance ** (-0.5 / exponent)
+        region = np.hypot(y[:, None] - center[1], x[None, :] - center[0]) < reach
+        return None if region.all() else region
+
+    def _banded_field(self, x, y, positions, phase_shifts, amplitudes, mask, field):
+        """Evaluate the exact field into ``field`` where ``mask`` is set, in bands of ``FIELD_BAND_ROWS`` rows."""
+        for row in range(0, len(y), self.FIELD_BAND_ROWS):
+            rows = slice(row, row + self.FIELD_BAND_ROWS)
+            columns = np.flatnonzero(mask[rows].any(axis=0))
+            if len(columns) == 0:
+                continue
+            # The regions are disks and rings around the array center, so only the columns they span are evaluated
+            columns = slice(columns[0], columns[-1] + 1)
+            exact = self.compute_field(x[columns], y[rows], positions, phase_shifts, amplitudes)
+            np.copyto(field[rows, columns], exact, where=mask[rows, columns])
+
+    def _exact_array_field(self, x, y, positions, phase_shifts, amplitudes=None, cache_phasors=True):
+        # Steering only changes the element weights, so reuse exp(1j * k * r) when it fits in memory
+        phasors = self.propagation_phasors(x, y, positions) if cache_phasors else None
+        if phasors is None:
+            return self.compute_field(x, y, positions, phase_shifts, amplitudes)
+        weights = np.exp(1j * phase_shifts) if amplitudes is None else amplitudes * np.exp(1j * phase_shifts)
+        return (weights.astype(phasors.dtype) @ phasors).reshape(len(y), len(x))
+
+    def _far_field_array_field(self, x, y, positions, phase_shifts, amplitudes=None, region=None, cache_phasors=True):
+        """
+        Field of one array with plane waves beyond its Fraunhofer distance and the exact sum inside it.
+
+        In the far field r_e ~ R - u.d_e, with R and u the distance and direction of the pixel from
+        the array center and d_e the element offset, so the field is exp(1j * k * R) * AF(u). AF is
+        tabulated once over the directions spanned by the far-field pixels and interpolated, which
+        costs O(P) per pixel instead of O(P * N). Near-field pixels are evaluated exactly in bands of
+        ``FIELD_BAND_ROWS`` rows restricted to the columns they span. Pixels outside ``region`` are left at zero.
+        """
+        center, offsets, radius, distance, far = self._far_field_layout(x, y, positions)
+        if region is not None:
+            far &= region
+        directions = np.arctan2(y[:, None] - center[1], x[None, :] - center[0])[far]
+        table_angles = self._far_field_table_angles(directions, radius)
+        if table_angles is None:
+            if region is None:
+                return self._exact_array_field(x, y, positions, phase_shifts, amplitudes, cache_phasors)
+            field = np.zeros((len(y), len(x)), dtype=np.complex128)
+            self._banded_field(x, y, positions, phase_shifts, amplitudes, region, field)
+            return field
+
+        # AF(angle) = sum_e a_e * exp(1j * (phase shift - k * u.d_e)), an (angles x elements) @ (elements,) product in scratch-sized blocks
+        weights = np.exp(1j * phase_shifts) if amplitudes is None else amplitudes * np.exp(1j * phase_shifts)
+        table = np.empty(len(table_angles), dtype=np.complex128)
+        block = int(max(1, self.scratch_buffer_bytes // (16 * len(positions))))
+        for start in range(0, len(table_angles), block):
+            angles = table_angles[start:start + block]
+            table[start:start + block] = np.exp(-1j * self.k * (np.outer(np.cos(angles), offsets[:, 0]) +
+                                                                np.outer(np.sin(angles), offsets[:, 1]))) @ weights
+
+        step = table_angles[1] - table_angles[0]
+        position = (directions - table_angles[0]) / step
+        index = np.minimum(np.floor(position).astype(np.int64), len(table_angles) - 2)
+        fraction = position - index
+        field = np.zeros((len(y), len(x)), dtype=np.complex128)
+        field[far] = np.exp(1j * self.k * distance[far]) * (table[index] * (1 - fraction) + table[index + 1] * fraction)
+        exponent = self.SPREADING_EXPONENTS[self.spreading]
+        if exponent:
+            field[far] *= np.maximum(distance[far], self.wavelength / (2 * np.pi)) ** -exponent
+
+        self._banded_field(x, y, positions, phase_shifts, amplitudes, ~far if region is None else region & ~far, field)
+        return field
+
+    def _far_field_layout(self, x, y, positions):
+        """
+        Classify the (y, x) grid for one array by its Fraunhofer distance.
+
+        The aperture D is taken as twice the largest element offset from the centroid. Pixels count
+        as far field from max(2 * D**2 / wavelength, D) on, where ``_far_field_error_bound`` holds,
+        and only where that bound is within ``far_field_tolerance`` when one is set.
+
+        Returns:
+            center (numpy.ndarray): Element centroid, the phase center of the plane waves.
+            offsets (numpy.ndarray): (N, 2) element offsets from the center.
+            radius (float): Largest element offset (D / 2).
+            distance (numpy.ndarray): (len(y), len(x)) distance of every pixel from the center.
+            far (numpy.ndarray): (len(y), len(x)) mask of the far-field pixels.
+        """
+        center = positions.mean(axis=0)
+        offsets = positions - center
+        radius = float(np.sqrt((offsets ** 2).sum(axis=1)).max())
+        distance = np.hypot(y[:, None] - center[1], x[None, :] - center[0])
+        far = distance >= max(self.fraunhofer_distance(2 * radius), 2 * radius)
+        if self.far_field_tolerance is not None:
+            far &= self._far_field_error_bound(radius, np.maximum(distance, 2 * radius)) <= self.far_field_tolerance
+        return center, offsets, radius, distance, far
+
+    def _far_field_table_angles(self, directions, radius):
+        """Return the sample angles of the far-field array factor table, or None when it would not pay off."""
+        if len(directions) == 0:
+            return None
+        step = self.FAR_FIELD_TABLE_STEP / max(self.k * radius, 1e-12)
+        first, last = float(directions.min()), float(directions.max())
+        samples = int(np.ceil((last - first) / step)) + 2
+        # Each table sample costs as much as an exactly evaluated pixel
+        if samples * 4 > len(directions):
+            return None
+        return first + step * np.arange(samples)
+
+    def _far_field_error_bound(self, radius, distance):
+        """
+        Upper bound on |far-field - exact| / N at the given distances from the array center.
+
+        Since r_e**2 = (R - u.d)**2 + |d|**2 - (u.d)**2, the path error r_e - (R - u.d) lies in
+        [0, |d|**2 / (2 * (R - |d|))]; each element's phasor error is at most k times that. The
+        linear interpolation of the table adds at most step**2 / 8 * ((k * |d|)**2 + k * |d|).
+        With a spreading loss the bound is relative to N * R ** -exponent, and using R instead of
+        r_e in the decay adds at most exponent * |d| / (R - |d|).
+        """
+        k_radius = self.k * radius
+        step = self.FAR_FIELD_TABLE_STEP / max(k_radius, 1e-12)
+        path_error = np.minimum(self.k * radius ** 2 / (2 * (distance - radius)), 2.0)
+        decay_error = self.SPREADING_EXPONENTS[self.spreading] * radius / (distance - radius)
+        return path_error + decay_error + step ** 2 / 8 * (k_radius ** 2 + k_radius)
+
+    def fraunhofer_distance(self, aperture):
+        """Return the Fraunhofer distance 2 * D**2 / wavelength of an aperture D (m)."""
+        return 2 * aperture ** 2 / self.wavelength
+
+    def field_regions(self, x_range, y_range, resolution=None):
+        """
+        Classify the grid into near- and far-field regions of every configured array.
+
+        Returns:
+            regions (list): One dict per array with its fraunhofer_distance (m), the far_field_fraction
+                of the grid beyond it, whether the plane-wave fast path is used for that region in
+                'auto' mode (far_field_used) and far_field_error_bound, the largest field error over the
+                far-field region relative to the array's peak field (its number of elements); None
+                without far-field pixels. The near-field region is always evaluated exactly.
+                culled_fraction is the part of the grid where the array's contribution is skipped.
+        """
+        x_points, y_points = self.resolution if resolution is None else resolution
+        x = np.linspace(x_range[0], x_range[1], int(x_points))
+        y = np.linspace(y_range[0], y_range[1], int(y_points))
+
+        regions = []
+        for positions in self.array_position_blocks():
+            center, _, radius, distance, far = self._far_field_layout(x, y, positions)
+            region = self._contributing_region(x, y, positions)
+            if region is not None:
+                far &= region
+            directions = np.arctan2(y[:, None] - center[1], x[None, :] - center[0])[far]
+            regions.append({
+                'fraunhofer_distance': self.fraunhofer_distance(2 * radius),
+                'far_field_fraction': float(far.mean()),
+                'far_field_used': self._far_field_table_angles(directions, radius) is not None,
+                'far_field_error_bound': float(self._far_field_error_bound(radius, distance[far]).max()) if far.any() else None,
+                'culled_fraction': 0.0 if region is None else float(1 - region.mean())
+            })
+        return regions
+
+    def clear_field_cache(self):
+        self._field_states.clear()
+
+    def array_position_blocks(self):
+        """Return one (N, 2) element position array per configured array (see ``Geometry.array_positions``)."""
+        return [array_positions(array_info) for array_info in self.arrays_info]
+
+    def compute_field(self, x, y, positions, phase_shifts, amplitudes=None):
+        """
+        Sum the complex field of all elements over the (y, x) grid.
+
+        Elements are processed in chunks sized so that the two scratch buffers stay
+        within ``scratch_buffer_bytes``; no per-element full-grid temporaries are allocated.
+
+        Args:
+            x (numpy.ndarray): x-coordinates of the grid columns.
+            y (numpy.ndarray): y-coordinates of the grid rows.
+            positions (numpy.ndarray): (M, 2) element coordinates.
+            phase_shifts (numpy.ndarray): (M,) phase shift applied to each element.
+            amplitudes (numpy.ndarray): (M,) amplitude of each element; None for unit amplitudes.
+
+        Returns:
+            field (numpy.ndarray): complex field of shape (len(y), len(x)).
+        """
+        field_real, field_imag = self._accumulate_field(x, y, positions, phase_shifts, amplitudes=amplitudes)
+        return field_real + 1j * field_imag
+
+    def simulate_multiple_arrays_tiled(self, x_range, y_range, resolution=None, memory_budget_bytes=256 * 1024 ** 2, out=None):
+        """
+        Simulate the intensity map tile by tile, keeping peak working memory within a budget.
+
+        Rows of the grid are evaluated in tiles whose accumulators and scratch buffers fit in
+        ``memory_budget_bytes``. The global maximum is tracked across tiles and applied in a
+        second pass, so the result matches ``simulate_multiple_arrays``. The budget is sized for
+        the NumPy engine; the numexpr and numba backends ignore the scratch share and only hold
+        their own tile accumulators, so they stay below it but do not use it to pick the tiles.
+
+        Args:
+            x_range (tuple): Range of x-coordinates (min, max).
+            y_range (tuple): Range of y-coordinates (min, max).
+            resolution (tuple): Grid size (x points, y points); defaults to ``self.resolution``.
+            memory_budget_bytes (int): Peak memory for the tile accumulators and scratch buffers.
+            out (numpy.ndarray or str): Preallocated (y points, x points) float array, e.g. a
+                ``numpy.memmap``, or a path of a ``.npy`` file to create memory-mapped.
+
+        Returns:
+            x (numpy.ndarray): x-coordinate array.
+            y (numpy.ndarray): y-coordinate array.
+            intensity (numpy.ndarray): Normalized intensity map (``out`` when given).
+        """
+        x_points, y_points = self.resolution if resolution is None else resolution
+        x = np.linspace(x_range[0], x_range[1], int(x_points))
+        y = np.linspace(y_range[0], y_range[1], int(y_points))
+        positions, phase_shifts, amplitudes = self.stack_element_positions()
+
+        if out is None:
+            out = np.empty((len(y), len(x)))
+        elif isinstance(out, str):
+            out = np.lib.format.open_memmap(out, mode='w+', dtype=np.float64, shape=(len(y), len(x)))
+        elif out.shape != (len(y), len(x)):
+            raise ValueError(f"Output shape {out.shape} does not match the grid {(len(y), len(x))}")
+
+        # Per tile pixel: three float64 accumulators plus two scratch buffers for at least one element
+        bytes_per_row = len(x) * 8 * 5
+        tile_rows = int(max(1, min(len(y), memory_budget_bytes // bytes_per_row)))
+        scratch_bytes = max(memory_budget_bytes - tile_rows * len(x) * 8 * 3, tile_rows * len(x) * 8 * 2)
+
+        peak = 0.0
+        for row in range(0, len(y), tile_rows):
+            rows = slice(row, min(row + tile_rows, len(y)))
+            field_real, field_imag = self._accumulate_field(x, y[rows], positions, phase_shifts, scratch_bytes, amplitudes)
+            np.square(field_real, out=field_real)
+            np.square(field_imag, out=field_imag)
+            field_real += field_imag
+            out[rows] = field_real
+            peak = max(peak, float(field_real.max()))
+            del field_real, field_imag  # Free this tile before the next one allocates its accumulators
+
+        for row in range(0, len(y), tile_rows):
+            out[row:row + tile_rows] /= peak + 1e-10  # Avoid division by zero
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return x, y, out
+
+    def simulate_frequency_sweep(self, frequencies, x_range, y_range, resolution=None, integrate=False):
+        """
+        Simulate the intensity map at many frequencies, computing element distances only once.
+
+        Element-to-pixel distances depend only on the geometry and the grid, so each chunk of
+        distances is evaluated once and reused for every frequency. With ``integrate`` the
+        unnormalized intensities are also integrated over frequency (trapezoidal rule) into a
+        broadband map. The sweep is evaluated in float64 and holds one complex field per
+        frequency while accumulating.
+
+        Args:
+            frequencies (array-like): Operating frequencies in Hz.
+            x_range (tuple): Range of x-coordinates (min, max).
+            y_range (tuple): Range of y-coordinates (min, max).
+            resolution (tuple): Grid size (x points, y points); defaults to ``self.resolution``.
+            integrate (bool): Also return the frequency-integrated intensity map.
+
+        Returns:
+            x (numpy.ndarray): x-coordinate array.
+            y (numpy.ndarray): y-coordinate array.
+            intensities (numpy.ndarray): (len(frequencies), len(y), len(x)) normalized intensity maps.
+            broadband (numpy.ndarray): Normalized frequency-integrated intensity map, or None.
+        """
+        frequencies = np.atleast_1d(np.asarray(frequencies, dtype=np.float64))
+        wave_numbers = 2 * np.pi * frequencies / 3e8
+        x_points, y_points = self.resolution if resolution is None else resolution
+        x = np.linspace(x_range[0], x_range[1], int(x_points))
+        y = np.linspace(y_range[0], y_range[1], int(y_points))
+
+        position_blocks = self.array_position_blocks()
+        positions = np.concatenate(position_blocks) if position_blocks else np.empty((0, 2))
+        phase_shifts = np.array([np.concatenate([self.element_excitations(array_info, block, k)[0]
+                                                 for array_info, block in zip(self.arrays_info, position_blocks)] or [np.empty(0)])
+                                 for k in wave_numbers])
+        weights = self.stack_element_weights()
+        amplitudes = None if weights is None else np.abs(weights)
+
+        field_real = np.zeros((len(frequencies), len(y), len(x)))
+        field_imag = np.zeros((len(frequencies), len(y), len(x)))
+        partial_sum = np.empty((len(y), len(x)))
+
+        # One distance buffer plus a phase and a trig buffer per chunk, and two decay buffers with spreading loss
+        exponent = self.SPREADING_EXPONENTS[self.spreading]
+        buffers = 5 if exponent else 3
+        chunk = int(max(1, min(len(positions), self.scratch_buffer_bytes // (buffers * len(x) * len(y) * 8))))
+        phase_buffer = np.empty((chunk, len(y), len(x)))
+        trig_buffer = np.empty((chunk, len(y), len(x)))
+        base_decay_buffer = np.empty((chunk, len(y), len(x))) if exponent else None
+        decay_buffer = np.empty((chunk, len(y), len(x))) if exponent else None
+        for start, stop, distances in self._distance_chunks(x, y, positions, chunk):
+            phase = phase_buffer[:stop - start]
+            trig = trig_buffer[:stop - start]
+            # The spreading loss is clamped at each frequency's own 1 / k. Since max(r, 1 / k) ** -exponent equals
+            # min(r ** -exponent, k ** exponent), r ** -exponent is evaluated once per chunk (clamped at the
+            # smallest floor) and each frequency only takes a minimum
+            base_decay = None
+            if exponent:
+                base_decay = self._spreading_decay(distances, exponent, base_decay_buffer[:stop - start], 1 / wave_numbers.max())
+            for index, k in enumerate(wave_numbers):
+                np.multiply(distances, k, out=phase)
+                phase += phase_shifts[index, start:stop, None, None]
+                decay = None
+                if base_decay is not None:
+                    decay = np.minimum(base_decay, k ** exponent, out=decay_buffer[:stop - start])
+                np.cos(phase, out=trig)
+                if decay is not None:
+                    trig *= decay
+                field_real[index] += self._element_sum(trig, amplitudes, start, stop, partial_sum)
+                np.sin(phase, out=trig)
+                if decay is not None:
+                    trig *= decay
+                field_imag[index] += self._element_sum(trig, amplitudes, start, stop, partial_sum)
+
+        # Reuse the accumulators for |E|^2
+        intensities = np.square(field_real, out=field_real)
+        intensities += np.square(field_imag, out=field_imag)
+        del field_imag
+
+        broadband = None
+        if integrate:
+            if len(frequencies) > 1:
+                widths = np.diff(frequencies)
+                weights = np.zeros(len(frequencies))
+                weights[:-1] += widths / 2
+                weights[1:] += widths / 2
+            else:
+                weights = np.ones(1)
+            broadband = np.tensordot(weights, intensities, axes=1)
+            broadband /= np.max(np.abs(broadband)) + 1e-10  # Avoid division by zero
+
+        intensities /= intensities.max(axis=(1, 2), keepdims=True) + 1e-10  # Avoid division by zero
+        return x, y, intensities, broadband
+
+    def _accumulate_field(self, x, y, positions, phase_shifts, scratch_bytes=None, amplitudes=None):
+        """
+        Return the real and imaginary parts of the summed field as two float64 (len(y), len(x)) arrays.
+
+        With more than one thread the NumPy engine shards the work across the thread pool: bands
+        of grid rows when there are enough rows, otherwise runs of elements. Each shard sums into
+        its own accumulators with its share of ``scratch_bytes``; row bands are then stacked and
+        element runs added together. NumPy releases the GIL inside the trigonometry and the sums,
+        so the shards run on separate cores.
+        """
+        if self.backend != 'numpy' and len(positions):
+            # Compiled backends fuse the whole sum, run their own threads and need no scratch buffers
+            set_backend_threads(self.backend, self.threads)
+            exponent = self.SPREADING_EXPONENTS[self.spreading]
+            return field_kernel(self.backend)(x, y, positions, phase_shifts, amplitudes, self.k, exponent, self.wavelength / (2 * np.pi))
+
+        shards = self._shard_count(len(positions) * len(x) * len(y))
+        if shards == 1:
+            return self._accumulate_chunks(x, y, positions, phase_shifts, scratch_bytes, amplitudes)
+
+        scratch_bytes = self.scratch_buffer_bytes if scratch_bytes is None else scratch_bytes
+        if len(y) >= shards:
+            # Each band sums into its own rows of the accumulators
+            field_real = np.empty((len(y), len(x)))
+            field_imag = np.empty((len(y), len(x)))
+            bounds = np.linspace(0, len(y), shards + 1).astype(int)
+            list(self._thread_pool_executor().map(
+                lambda rows: self._accumulate_chunks(x, y[rows], positions, phase_shifts, scratch_bytes // shards, amplitudes,
+                                                     (field_real[rows], field_imag[rows])),
+                [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]))
+            return field_real, field_imag
+
+        # Every element run past the first holds three float64 grid accumulators of its own, paid from the
+        # scratch budget, and each run still needs room for two scratch grids. Only use as many runs as fit.
+        grid_bytes = len(x) * len(y) * 8
+        shards = int(min(shards, len(positions), (scratch_bytes + 3 * grid_bytes) // (5 * grid_bytes)))
+        if shards <= 1:
+            return self._accumulate_chunks(x, y, positions, phase_shifts, scratch_bytes, amplitudes)
+        scratch_bytes = (scratch_bytes - (shards - 1) * 3 * grid_bytes) // shards
+        bounds = np.linspace(0, len(positions), shards + 1).astype(int)
+        parts = self._thread_pool_executor().map(
+            lambda elements: self._accumulate_chunks(x, y, positions[elements], phase_shifts[elements], scratch_bytes,
+                                                     None if amplitudes is None else amplitudes[elements]),
+            [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])])
+        field_real, field_imag = next(parts)
+        for real_part, imag_part in parts:
+            field_real += real_part
+            field_imag += imag_part
+        return field_real, field_imag
+
+    def _accumulate_chunks(self, x, y, positions, phase_shifts, scratch_bytes=None, amplitudes=None, out=None):
+        """Serial NumPy engine of ``_accumulate_field``; ``out`` is an optional (real, imag) pair of accumulators to overwrite."""
+        if out is None:
+            field_real = np.zeros((len(y), len(x)))
+            field_imag = np.zeros((len(y), len(x)))
+        else:
+            field_real, field_imag = out
+            field_real[...] = 0
+            field_imag[...] = 0
+        # Chunk sums stay in the compute dtype; only chunk-sized runs are summed before the float64 accumulators
+        partial_sum = np.empty((len(y), len(x)), dtype=self.real_dtype)
+        trig_buffer = None
+
+        for start, stop, phase, decay in self._phase_chunks(x, y, positions, phase_shifts, buffers=2, scratch_bytes=scratch_bytes):
+            if trig_buffer is None:
+                trig_buffer = np.empty_like(phase)
+            trig = trig_buffer[:stop - start]
+
+            np.cos(phase, out=trig)
+            if decay is not None:
+                trig *= decay
+            field_real += self._element_sum(trig, amplitudes, start, stop, partial_sum)
+            np.sin(phase, out=trig)
+            if decay is not None:
+                trig *= decay
+            field_imag += self._element_sum(trig, amplitudes, start, stop, partial_sum)
+
+        return field_real, field_imag
+
+    def _shard_count(self, work):
+        """Number of threads worth using for ``work`` pixel-element products."""
+        return int(max(1, min(self.threads, work // self.THREAD_MIN_WORK)))
+
+    def _thread_pool_executor(self):
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="FieldShard")
+        return self._thread_pool
+
+    @staticmethod
+    def _element_sum(trig, amplitudes, start, stop, out):
+        """Sum an (n, len(y), len(x)) chunk over its elements into ``out``, weighted by ``amplitudes[start:stop]`` if given."""
+        if amplitudes is None:
+            return np.sum(trig, axis=0, out=out)
+        np.dot(amplitudes[start:stop].astype(trig.dtype), trig.reshape(stop - start, -1), out=out.reshape(-1))
+        return out
+
+    def propagation_phasors(self, x, y, positions):
+        """
+        Return the cached (M, P) stack of exp(1j * k * r) for the given grid and elements.
+
+        The stack does not depend on the steering angle, so a steering change reduces to
+        one matrix-vector product with the element weights. Stacks are kept in an LRU
+        bounded by ``phasor_cache_bytes``; None is returned when a stack would not fit,
+        and the caller streams the field with ``compute_field`` instead.
+        """
+        complex_dtype = np.complex128 if self.precision == 'double' else np.complex64
+        nbytes = len(positions) * len(x) * len(y) * np.dtype(complex_dtype).itemsize
+        if nbytes == 0 or nbytes > self.phasor_cache_bytes:
+            return None
+
+        key = (self.precision, self.spreading, self.k, positions.tobytes(), np.asarray(x).tobytes(), np.asarray(y).tobytes())
+        phasors = self._phasor_cache.get(key)
+        if phasors is not None:
+            self._phasor_cache.move_to_end(key)
+            return phasors
+
+        phasors = np.empty((len(positions), len(y) * len(x)), dtype=complex_dtype)
+        shards = min(self._shard_count(len(positions) * len(x) * len(y)), len(positions))
+        bounds = np.linspace(0, len(positions), shards + 1).astype(int)
+        scratch_bytes = self.scratch_buffer_bytes // shards
+        if shards == 1:
+            self._fill_phasors(phasors, x, y, positions, scratch_bytes)
+        else:
+            # Each thread fills its own rows of the stack
+            list(self._thread_pool_executor().map(
+                lambda elements: self._fill_phasors(phasors[elements], x, y, positions[elements], scratch_bytes),
+                [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]))
+
+        self._phasor_cache[key] = phasors
+        while sum(cached.nbytes for cached in self._phasor_cache.values()) > self.phasor_cache_bytes:
+            self._phasor_cache.popitem(last=False)
+        return phasors
+
+    def _fill_phasors(self, phasors, x, y, positions, scratch_bytes):
+        for start, stop, phase, decay in self._phase_chunks(x, y, positions, buffers=1, scratch_bytes=scratch_bytes):
+            np.cos(phase.reshape(stop - start, -1), out=phasors.real[start:stop])
+            np.sin(phase.reshape(stop - start, -1), out=phasors.imag[start:stop])
+            if decay is not None:
+                phasors[start:stop] *= decay.reshape(stop - start, -1)
+
+    def _phasor_stacks_fit(self, x, y, position_blocks):
+        """Whether the phasor stacks of these arrays (identical geometries counted once) fit in ``phasor_cache_bytes`` together."""
+        itemsize = np.dtype(np.complex128 if self.precision == 'double' else np.complex64).itemsize
+        elements = {positions.tobytes(): len(positions) for positions in position_blocks}
+        return sum(elements.values()) * len(x) * len(y) * itemsize <= self.phasor_cache_bytes
+
+    def clear_phasor_cache(self):
+        self._phasor_cache.clear()
+
+    def _phase_chunks(self, x, y, positions, phase_shifts=None, buffers=1, scratch_bytes=None):
+        """
+        Yield (start, stop, phase, decay) with phase = k * r (+ phase shift) for consecutive element chunks.
+
+        ``phase`` is an (n, len(y), len(x)) view into a reused scratch buffer of ``real_dtype``; the
+        chunk size keeps ``buffers`` such buffers, plus the float64 distances of the mixed mode and
+        the decay buffer, within ``scratch_bytes`` (``scratch_buffer_bytes`` by default). Callers may
+        overwrite the yielded phase in place. ``decay`` holds the spreading loss r ** -exponent, or is
+        None without spreading.
+
+        In mixed precision the phase is wrapped to [0, 2*pi) in float64 before being rounded to
+        float32, so its error does not grow with the distance in wavelengths.
+        """
+        scratch_bytes = self.scratch_buffer_bytes if scratch_bytes is None else scratch_bytes
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        num_elements = len(positions)
+        if num_elements == 0:
+            return
+
+        mixed = self.precision == 'mixed'
+        exponent = self.SPREADING_EXPONENTS[self.spreading]
+        distance_dtype = np.float32 if self.precision == 'single' else np.float64
+        pixels = len(x) * len(y)
+        bytes_per_element = pixels * ((buffers + (1 if exponent else 0)) * np.dtype(self.real_dtype).itemsize + (8 if mixed else 0))
+        chunk = int(max(1, min(num_elements, scratch_bytes // bytes_per_element)))
+        phase_buffer = np.empty((chunk, len(y), len(x)), dtype=np.float32) if mixed else None
+        decay_buffer = np.empty((chunk, len(y), len(x)), dtype=self.real_dtype) if exponent else None
+        k = distance_dtype(self.k)
+
+        for start, stop, distances in self._distance_chunks(x, y, positions, chunk, distance_dtype):
+            decay = None
+            if exponent:
+                decay = self._spreading_decay(distances, exponent, decay_buffer[:stop - start])
+            distances *= k
+            if phase_shifts is not None:
+                distances += phase_shifts[start:stop, None, None].astype(distance_dtype)
+
+            if mixed:
+                np.remainder(distances, 2 * np.pi, out=distances)
+                phase = phase_buffer[:stop - start]
+                phase[...] = distances
+            else:
+                phase = distances
+            yield start, stop, phase, decay
+
+    def _spreading_decay(self, distances, exponent, out, floor=None):
+        """
+        Write distances ** -exponent into ``out``, with distances clamped to ``floor`` near the elements.
+
+        The floor defaults to wavelength / (2 * pi), i.e. 1 / k at the operating frequency.
+        """
+        floor = self.wavelength / (2 * np.pi) if floor is None else floor
+        np.maximum(distances, floor, out=out)
+        return np.power(out, -exponent, out=out)
+
+    @staticmethod
+    def _distance_chunks(x, y, positions, chunk, dtype=np.float64):
+        """
+        Yield (start, stop, distances) for consecutive chunks of ``chunk`` elements.
+
+        ``distances`` is an (n, len(y), len(x)) view into one reused buffer of ``dtype`` that
+        callers may overwrite in place.
+        """
+        distance_buffer = np.empty((chunk, len(y), len(x)), dtype=dtype)
+        for start in range(0, len(positions), chunk):
+            stop = min(start + chunk, len(positions))
+            distances = distance_buffer[:stop - start]
+
+            # Squared offsets are separable: (n, nx) and (n, ny) instead of (n, ny, nx)
+            dx2 = ((x[None, :] - positions[start:stop, 0, None]) ** 2).astype(dtype, copy=False)
+            dy2 = ((y[None, :] - positions[start:stop, 1, None]) ** 2).astype(dtype, copy=False)
+            np.add(dy2[:, :, None], dx2[:, None, :], out=distances)
+            np.sqrt(distances, out=distances)
+            yield start, stop, distances
+
     def calculate_array_factor(self, angles):
-        array_factor = np.zeros_like(angles, dtype=np.complex128)
-        positions = self.calculate_element_positions(self.arrays_info[0]['num_elements'], self.arrays_info[0]['spacing'],
-                                                     self.arrays_info[0]['curvature'])
-        for x, y in positions:
-            phase_shift = -self.k * (x * np.sin(np.radians(self.steering_angle)) + y * np.cos(np.radians(self.steering_angle)))
-            array_factor += np.exp(1j * (self.k * (x * np.sin(np.radians(angles)) + y * np.cos(np.radians(angles))) + phase_shift))
-        return np.abs(array_factor) ** 2
+        """Beam profile |AF|^2 of all configured arrays at the current steering angle."""
+        return self.calculate_array_factors(angles, [self.steering_angle])[0]
+
+    def calculate_array_factors(self, angles, steering_angles, method='auto'):
+        """
+        Compute the beam profiles of all configured arrays for many steering angles in one call.
+
+        Each array's apodization weights (its ``weights`` entry) scale its elements. When every
+        array is a uniform linear array the profile is taken from a zero-padded FFT of its
+        element weights ('fft', O(N log N)). Otherwise the array factor factorizes
+        into a (steering x element) weight matrix times an (element x angle) observation
+        matrix, so a whole scan table is one matrix product ('direct').
+
+        Args:
+            angles (array-like): Observation angles in degrees.
+            steering_angles (array-like): Steering angles in degrees.
+            method (str): 'auto', 'fft' or 'direct'.
+
+        Returns:
+            array_factors (numpy.ndarray): |AF|^2 of shape (len(steering_angles),) + angles.shape.
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        observation_angles = np.radians(angles.ravel())
+        steering = np.radians(np.atleast_1d(np.asarray(steering_angles, dtype=np.float64)))
+
+        if method not in ('auto', 'fft', 'direct'):
+            raise ValueError("Array factor method must be 'auto', 'fft' or 'direct'")
+        if method != 'direct':
+            position_blocks = self.array_position_blocks()
+            layouts = [self._uniform_linear_layout(positions) for positions in position_blocks]
+            if layouts and all(layout is not None for layout in layouts):
+                weight_blocks = [self.element_weights(array_info, len(positions)) for array_info, positions in zip(self.arrays_info, position_blocks)]
+                array_factors = self._array_factors_fft(observation_angles, steering, layouts, weight_blocks)
+                return array_factors.reshape((len(steering),) + angles.shape)
+            if method == 'fft':
+                raise ValueError("The FFT array factor needs every array to be a uniform linear array")
+
+        positions, _, _ = self.stack_element_positions()
+        steering_weights = np.exp(-1j * self.k * (np.outer(np.sin(steering), positions[:, 0]) + np.outer(np.cos(steering), positions[:, 1])))
+        weights = self.stack_element_weights()
+        if weights is not None:
+            steering_weights *= weights
+        observation = np.exp(1j * self.k * (np.outer(positions[:, 0], np.sin(observation_angles)) +
+                                            np.outer(positions[:, 1], np.cos(observation_angles))))
+        array_factors = np.abs(steering_weights @ observation) ** 2
+        return array_factors.reshape((len(steering),) + angles.shape)
+
+    def _array_factors_fft(self, observation_angles, steering, layouts, weight_blocks=None):
+        """
+        |AF|^2 of uniform linear arrays from the zero-padded FFT of their element weights.
+
+        With u = sin(theta) - sin(steering), an array of ``count`` elements spaced ``spacing``
+        apart contributes exp(1j * k * (x0 * u + y0 * v)) * sum_e w_e * exp(1j * e * k * spacing * u).
+        The sum is periodic in k * spacing * u, so it is sampled once by an inverse FFT and
+        linearly interpolated for every (steering, angle) pair.
+        """
+        u = np.sin(observation_angles)[None, :] - np.sin(steering)[:, None]
+        v = np.cos(observation_angles)[None, :] - np.cos(steering)[:, None]
+        field = np.zeros(u.shape, dtype=np.complex128)
+
+        for (x0, y0, spacing, count), weights in zip(layouts, weight_blocks or [None] * len(layouts)):
+            length = 1 << int(np.ceil(np.log2(count * self.FFT_OVERSAMPLING)))
+            weights = np.ones(count) if weights is None else weights
+            spectrum = length * np.fft.ifft(weights, length)  # sum_e w_e * exp(2j * pi * e * m / length)
+            spectrum = np.append(spectrum, spectrum[0])  # Wrap-around sample for interpolation
+
+            position = np.mod(self.k * spacing * u / (2 * np.pi), 1.0) * length
+            index = np.minimum(np.floor(position).astype(np.int64), length - 1)
+            fraction = position - index
+            samples = spectrum[index] * (1 - fraction) + spectrum[index + 1] * fraction
+            field += np.exp(1j * self.k * (x0 * u + y0 * v)) * samples
+
+        return np.abs(field) ** 2
+
+    def calculate_taper_profiles(self, angles, weight_sets, steering_angle=None):
+        """
+        Beam profiles |AF|^2 of many candidate weight sets in one matrix product.
+
+        The (element x angle) steering matrix exp(1j * k * (x * u + y * v)) only depends on the
+        geometry, the frequency and the steering angle, so it is cached and every weight set
+        costs one row of a (weight sets x elements) @ (elements x angles) product. The ``weights``
+        entries of ``arrays_info`` are ignored; the candidates replace them.
+
+        Args:
+            angles (array-like): Observation angles in degrees.
+            weight_sets (sequence): Candidate weights, each either an (M,) complex vector over the
+                elements of all arrays (``stack_element_positions`` order) or a taper spec
+                ('hamming', {'taper': 'taylor', 'sidelobe_db': 35}, ...) applied to every array.
+            steering_angle (float): Steering angle in degrees; defaults to ``self.steering_angle``.
+
+        Returns:
+            profiles (numpy.ndarray): |AF|^2 of shape (len(weight_sets),) + angles.shape.
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        steering_matrix = self.steering_matrix(angles.ravel(), self.steering_angle if steering_angle is None else steering_angle)
+        counts = [len(positions) for positions in self.array_position_blocks()]
+
+        weight_matrix = np.empty((len(weight_sets), len(steering_matrix)), dtype=np.complex128)
+        for index, weights in enumerate(weight_sets):
+            if isinstance(weights, (str, dict)):
+                blocks = [apodization_weights(weights, count) for count in counts]
+                weights = np.concatenate([np.ones(count) if block is None else block for count, block in zip(counts, blocks)])
+            weight_matrix[index] = weights
+
+        profiles = np.abs(weight_matrix @ steering_matrix) ** 2
+        return profiles.reshape((len(weight_sets),) + angles.shape)
+
+    def steering_matrix(self, angles, steering_angle):
+        """Return the cached (M, len(angles)) matrix exp(1j * k * (x * u + y * v)) of all elements, angles in degrees."""
+        angles = np.asarray(angles, dtype=np.float64)
+        positions, _, _ = self.stack_element_positions()
+        key = (self.k, positions.tobytes(), float(steering_angle), angles.tobytes())
+        matrix = self._steering_matrices.get(key)
+        if matrix is not None:
+            self._steering_matrices.move_to_end(key)
+            return matrix
+
+        steering, observation_angles = np.radians(steering_angle), np.radians(angles)
+        u = np.sin(observation_angles) - np.sin(steering)
+        v = np.cos(observation_angles) - np.cos(steering)
+        matrix = np.exp(1j * self.k * (np.outer(positions[:, 0], u) + np.outer(positions[:, 1], v)))
+        self._steering_matrices[key] = matrix
+        if len(self._steering_matrices) > self.STEERING_MATRIX_CACHE_SIZE:
+            self._steering_matrices.popitem(last=False)
+        return matrix
+
+    @staticmethod
+    def _uniform_linear_layout(positions):
+        """Return (x0, y0, spacing, count) if the elements lie evenly spaced along x, else None."""
+        count = len(positions)
+        if count == 0:
+            return None
+        x, y = positions[:, 0], positions[:, 1]
+        spacing = (x[-1] - x[0]) / (count - 1) if count > 1 else 0.0
+        scale = max(abs(spacing) * count, 1e-12)
+        if np.ptp(y) > 1e-9 * scale or np.max(np.abs(x - (x[0] + spacing * np.arange(count)))) > 1e-9 * scale:
+            return None
+        return x[0], y[0], spacing, count
 
     def calculate_element_positions(self, num_elements, element_spacing, curvature_degree):
-        positions = []
-        if curvature_degree == 0:  # Linear array
-            # Start at (0, 0) and lay out elements symmetrically
-            positions = [(i * element_spacing - (num_elements - 1) * element_spacing / 2, 0) for i in range(num_elements)]
-        else:  # Curved array
-            # Calculate the radius of the arc
-            arc_length = (num_elements - 1) * element_spacing
-            curvature_radians = np.radians(curvature_degree)
-            radius = arc_length / curvature_radians if curvature_radians != 0 else np.inf
-
-            # Distribute elements evenly along the arc
-            for i in range(num_elements):
-                angle = -curvature_radians / 2 + i * (curvature_radians / (num_elements - 1))
-                x = radius * np.cos(angle) - radius  # Center the arc
-                y = radius * np.sin(angle)
-                positions.append((x, y))
-
-        # Debug: Print positions
-        return positions
+        """Return the read-only (N, 2) element positions of a linear (zero curvature) or arc array, memoized by geometry."""
+        layout = 'linear' if curvature_degree == 0 else 'arc'
+        return cached_layout(layout, int(num_elements), float(element_spacing), float(curvature_degree))
+
+    @staticmethod
+    def element_positions_cache_info():
+        """Hit/miss counters of the element geometry cache (a functools ``CacheInfo``)."""
+        return cached_layout.cache_info()
+
+    @staticmethod
+    def clear_element_positions_cache():
+        cached_layout.cache_clear()
 
     # -------------------------------------------------------------------------------------------------------------------------------------
     def update_operating_frequency(self, frequency):
@@ -81,3 +949,169 @@ class BeamformingSimulator:
 
     def update_steering_angle(self, steering_angle):
         self.steering_angle = steering_angle
+
+    def update_precision(self, precision):
+        """
+        Select the compute precision of the field engine.
+
+        'double' evaluates everything in float64/complex128. 'single' uses float32 distances,
+        phases and complex64 phasors. 'mixed' keeps float64 distances but wraps the phase
+        before rounding it to float32 for the trigonometry and the phasor stacks. Reduced
+        precisions still add element chunks into float64 accumulators; see ``precision_report``.
+        """
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Precision must be one of {', '.join(self.PRECISIONS)}")
+        self.precision = precision
+        self.real_dtype = np.float64 if precision == 'double' else np.float32
+        if self.requested_backend is not None:
+            self.backend = resolve_backend(self.requested_backend, precision)
+
+    def precision_report(self, x_range, y_range, resolution=None):
+        """
+        Compare the normalized intensity of the current precision against the float64 path.
+
+        Both runs bypass the phasor and field caches so the timings compare the engines.
+
+        Returns:
+            report (dict): precision, max_abs_error and rms_error of the normalized intensity,
+                and the seconds taken by the current precision and by the float64 reference.
+        """
+        return {'precision': self.precision, **self._engine_comparison('precision', 'double', x_range, y_range, resolution)}
+
+    def backend_report(self, x_range, y_range, resolution=None):
+        """
+        Compare the normalized intensity of the current backend against the NumPy engine.
+
+        Returns:
+            report (dict): backend, max_abs_error and rms_error of the normalized intensity,
+                and the seconds taken by the current backend and by the NumPy reference.
+        """
+        return {'backend': self.backend, **self._engine_comparison('backend', 'numpy', x_range, y_range, resolution)}
+
+    def frequency_sweep_report(self, frequencies, x_range, y_range, resolution=None):
+        """
+        Compare ``simulate_frequency_sweep`` against ``simulate_multiple_arrays`` run at each frequency.
+
+        The per-frequency runs bypass the phasor and field caches and use float64 and the exact field
+        model like the sweep.
+
+        Returns:
+            report (dict): frequencies and, per frequency, the max_abs_error of the normalized intensity.
+        """
+        frequencies = np.atleast_1d(np.asarray(frequencies, dtype=np.float64))
+        _, _, intensities, _ = self.simulate_frequency_sweep(frequencies, x_range, y_range, resolution)
+        frequency, precision, field_model = self.frequency, self.precision, self.field_model
+        cache_limits = (self.phasor_cache_bytes, self.field_cache_bytes)
+        self.phasor_cache_bytes = self.field_cache_bytes = 0
+        errors = []
+        try:
+            self.update_precision('double')
+            self.update_field_model('exact')
+            for frequency_value, swept in zip(frequencies, intensities):
+                self.update_operating_frequency(frequency_value)
+                _, _, reference = self.simulate_multiple_arrays(x_range, y_range, resolution)
+                errors.append(float(np.abs(swept - reference).max()))
+        finally:
+            self.update_operating_frequency(frequency)
+            self.update_precision(precision)
+            self.update_field_model(field_model)
+            self.phasor_cache_bytes, self.field_cache_bytes = cache_limits
+        return {'frequencies': frequencies.tolist(), 'max_abs_error': errors}
+
+    def _engine_comparison(self, setting, reference_value, x_range, y_range, resolution):
+        # Time the engine, not cache hits
+        current = getattr(self, f'requested_{setting}', getattr(self, setting))
+        cache_limits = (self.phasor_cache_bytes, self.field_cache_bytes)
+        update = getattr(self, f'update_{setting}')
+        self.phasor_cache_bytes = self.field_cache_bytes = 0
+        try:
+            started = time.perf_counter()
+            _, _, measured = self.simulate_multiple_arrays(x_range, y_range, resolution)
+            measured_seconds = time.perf_counter() - started
+
+            update(reference_value)
+            started = time.perf_counter()
+            _, _, reference = self.simulate_multiple_arrays(x_range, y_range, resolution)
+            reference_seconds = time.perf_counter() - started
+        finally:
+            update(current)
+            self.phasor_cache_bytes, self.field_cache_bytes = cache_limits
+
+        error = np.abs(measured.astype(np.float64) - reference)
+        return {
+            'max_abs_error': float(error.max()),
+            'rms_error': float(np.sqrt(np.mean(error ** 2))),
+            'seconds': measured_seconds,
+            'reference_seconds': reference_seconds
+        }
+
+    def update_field_model(self, field_model):
+        """
+        Select how ``simulate_multiple_arrays`` evaluates the field.
+
+        'exact' sums spherical waves from every element at every pixel. 'auto' switches each array
+        to its plane-wave approximation beyond its Fraunhofer distance; see ``field_regions`` for
+        the regions and their error bounds. The tiled and frequency-sweep paths are always exact.
+        """
+        if field_model not in self.FIELD_MODELS:
+            raise ValueError(f"Field model must be one of {', '.join(self.FIELD_MODELS)}")
+        self.field_model = field_model
+
+    def update_far_field_tolerance(self, far_field_tolerance):
+        """
+        Set the largest far-field error bound accepted per pixel in the 'auto' field model.
+
+        None only requires pixels to be beyond the Fraunhofer distance; smaller values keep more
+        pixels on the exact path (see ``field_regions``).
+        """
+        if far_field_tolerance is not None and far_field_tolerance < 0:
+            raise ValueError("Far-field tolerance must be non-negative or None")
+        self.far_field_tolerance = far_field_tolerance
+
+    def update_spreading(self, spreading):
+        """
+        Select the spreading loss of each element's wave.
+
+        None keeps unit-amplitude waves at every distance. 'cylindrical' (amplitude ~ r ** -0.5, a
+        2D line source) and 'spherical' (~ 1 / r) make distant arrays fade, which lets the field
+        engine skip pixels where an array's contribution is below ``cull_tolerance``.
+        """
+        if spreading not in self.SPREADING_EXPONENTS:
+            raise ValueError(f"Spreading must be one of {', '.join(str(name) for name in self.SPREADING_EXPONENTS)}")
+        self.spreading = spreading
+
+    def update_backend(self, backend):
+        """
+        Select the engine that streams the exact field (see ``App.Field_Backends``).
+
+        'numpy' is the chunked engine above. 'numexpr' and 'numba' fuse the distance, phase and
+        exp-accumulate into one multi-threaded pass over the grid and always compute in float64.
+        'auto' uses numba in double precision when it is installed (its first call pays the JIT
+        compilation) and NumPy otherwise, so single and mixed precision previews stay on NumPy;
+        it is re-resolved whenever the precision changes. A backend whose package is missing
+        falls back to 'numpy'. The phasor stacks, the far-field tables and the frequency sweep
+        always use NumPy.
+        """
+        self.backend = resolve_backend(backend, self.precision)
+        self.requested_backend = backend
+
+    def update_threads(self, threads):
+        """
+        Set how many threads the field engine may use; None uses every CPU core.
+
+        Large NumPy sums and phasor stacks are sharded across a thread pool of this size (see
+        ``_accumulate_field``), and the compiled backends run this many threads. 1 keeps
+        everything on the calling thread.
+        """
+        threads = (os.cpu_count() or 1) if threads is None else int(threads)
+        if threads < 1:
+            raise ValueError("Thread count must be at least 1")
+        if threads != self.threads and self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        self.threads = threads
+
+    def update_resolution(self, x_points, y_points):
+        if x_points < 2 or y_points < 2:
+            raise ValueError("Grid resolution must be at least 2 x 2")
+        self.resolution = (int(x_points), int(y_points))
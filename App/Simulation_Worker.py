@@ -0,0 +1,144 @@
+import contextlib
+import threading
+import traceback
+
+import numpy as np
+from PyQt5 import QtCore
+
+from App.Simulation import BeamformingSimulator
+
+
+class SimulationWorker(QtCore.QThread):
+    """
+    Runs BeamformingSimulator off the GUI thread.
+
+    Requests are coalesced: only the most recent parameter set submitted while the worker
+    is busy is computed, older pending requests are dropped. Each result is posted back to
+    the GUI thread through ``result_ready``. With a ``result_store``, full-resolution results
+    are persisted and reloaded memory-mapped instead of being recomputed. With a ``monitor``
+    (PerformanceMonitor), the compute stages are timed and coalesced requests are counted.
+
+    A request that raises is logged through ``logger`` (LoggingManager) and reported with
+    ``request_failed`` instead of ending the thread, since an exception escaping ``run`` aborts
+    the whole process under PyQt5. Result store I/O errors only disable the store for that request.
+    """
+    result_ready = QtCore.pyqtSignal(object)
+    request_failed = QtCore.pyqtSignal(object)
+
+    def __init__(self, result_store=None, monitor=None, logger=None, parent=None):
+        super().__init__(parent)
+        self.result_store = result_store
+        self.monitor = monitor
+        self.logger = logger
+        self._condition = threading.Condition()
+        self._pending_request = None
+        self._stopping = False
+        self.submitted_requests = 0
+        self.dropped_requests = 0
+        self.failed_requests = 0
+        self.simulator = None  # Owned by the worker thread once started
+
+    def submit(self, request):
+        """
+        Queue a parameter snapshot for computation, replacing any request still pending.
+
+        Args:
+            request (dict): frequency, steering_angle, arrays_info, x_range, y_range, resolution, angles,
+                precision, field_model and preview (previews are never persisted).
+        """
+        with self._condition:
+            self.submitted_requests += 1
+            request['request_id'] = self.submitted_requests
+            if self._pending_request is not None:
+                self.dropped_requests += 1
+                if self.monitor is not None:
+                    self.monitor.increment('dropped_frames')
+            self._pending_request = request
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._pending_request = None
+            self._condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while self._pending_request is None and not self._stopping:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                request, self._pending_request = self._pending_request, None
+
+            try:
+                if self.monitor is None:
+                    result = self.compute(request)
+                else:
+                    with self.monitor.span('compute'):
+                        result = self.compute(request)
+            except Exception:
+                self.failed_requests += 1
+                self.log_error("Simulation request %d failed:\n%s", request['request_id'], traceback.format_exc())
+                self.request_failed.emit(request)
+                continue
+            self.result_ready.emit(result)
+
+    def log_error(self, message, *args):
+        if self.logger is not None:
+            self.logger.log_error(message, *args)
+
+    def span(self, stage):
+        return self.monitor.span(stage) if self.monitor is not None else contextlib.nullcontext()
+
+    def compute(self, request):
+        persist = self.result_store is not None and not request.get('preview', False)
+        if persist:
+            configuration = self.store_configuration(request)
+            try:
+                with self.span('store_lookup'):
+                    stored = self.result_store.get(configuration)
+            except OSError as error:
+                self.log_error("Result store lookup failed, computing without the store: %s", error)
+                stored, persist = None, False
+            if stored is not None:
+                return dict(stored, request=request)
+
+        if self.simulator is None:
+            self.simulator = BeamformingSimulator(request['frequency'], request['steering_angle'], request['arrays_info'])
+        else:
+            self.simulator.arrays_info = request['arrays_info']
+            self.simulator.update_operating_frequency(request['frequency'])
+            self.simulator.update_steering_angle(request['steering_angle'])
+        self.simulator.update_precision(request.get('precision', 'double'))
+        self.simulator.update_field_model(request.get('field_model', 'exact'))
+
+        with self.span('simulate'):
+            x, y, intensity = self.simulator.simulate_multiple_arrays(request['x_range'], request['y_range'], request['resolution'])
+        angles = np.asarray(request['angles'])
+        with self.span('array_factor'):
+            array_factor = self.simulator.calculate_array_factor(angles)
+        result = {
+            'x': x,
+            'y': y,
+            'intensity': intensity,
+            'angles': angles,
+            'array_factor': array_factor
+        }
+        if persist:
+            try:
+                with self.span('store_write'):
+                    self.result_store.put(configuration, result)
+            except OSError as error:
+                self.log_error("Result store write failed, result not persisted: %s", error)
+        return dict(result, request=request)
+
+    @staticmethod
+    def store_configuration(request):
+        angles = np.asarray(request['angles'])
+        configuration = {name: request[name] for name in ('frequency', 'steering_angle', 'arrays_info', 'x_range', 'y_range', 'resolution')}
+        configuration['precision'] = request.get('precision', 'double')
+        configuration['field_model'] = request.get('field_model', 'exact')
+        configuration['angles'] = (float(angles[0]), float(angles[-1]), len(angles))
+        return configuration
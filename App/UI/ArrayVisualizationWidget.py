@@ -3,22 +3,35 @@ from PyQt5.QtGui import QPainter, QColor, QPen
 from PyQt5.QtCore import QPoint
 from math import cos, radians, sin
 
+from App.Geometry import array_offsets
+
 
 class ArrayVisualizationWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.array_configs = []
+        self.array_configs = []  # One dict per array: spacing, num_elements, curvature_angle, offset (x, y) and rotation
 
-    def addArray(self, spacing, num_elements, curvature_angle):
+    def addArray(self, spacing, num_elements, curvature_angle, offset=(0.0, 0.0), rotation=0.0):
         # Adds a new array configuration
-        self.array_configs.append((spacing, num_elements, curvature_angle))
+        self.array_configs.append({
+            'spacing': spacing,
+            'num_elements': num_elements,
+            'curvature_angle': curvature_angle,
+            'offset': tuple(offset),
+            'rotation': rotation
+        })
         self.update()
 
-    def editArray(self, index, spacing, num_elements, curvature_angle):
+    def editArray(self, index, spacing, num_elements, curvature_angle, offset=None, rotation=None):
         # Adjust index to zero-based for internal processing
-        zero_based_index = 0
+        zero_based_index = index - 1
         if 0 <= zero_based_index < len(self.array_configs):
-            self.array_configs[0] = (spacing, num_elements, curvature_angle)
+            config = self.array_configs[zero_based_index]
+            config.update(spacing=spacing, num_elements=num_elements, curvature_angle=curvature_angle)
+            if offset is not None:
+                config['offset'] = tuple(offset)
+            if rotation is not None:
+                config['rotation'] = rotation
             self.update()
         else:
             raise ValueError("Array index out of range")  # Provide feedback for invalid index
@@ -28,19 +41,35 @@ class ArrayVisualizationWidget(QWidget):
         target_length = array_num
         current_length = len(self.array_configs)
         if target_length > current_length:
-            # Add new arrays with default settings
+            # New arrays copy the parameters of the last one
+            template = self.array_configs[-1] if self.array_configs else {'spacing': 0.05, 'num_elements': 2, 'curvature_angle': 0}
             for _ in range(target_length - current_length):
-                # self.addArray()  # Use default parameters
-                pass
+                self.addArray(template['spacing'], template['num_elements'], template['curvature_angle'])
         elif target_length < current_length:
             # Remove excess arrays
             self.array_configs = self.array_configs[:target_length]
+        self.spreadArrays()
         self.update()  # Redraw the widget with updated settings
 
+    def spreadArrays(self):
+        # Place the arrays side by side along x, centered on the origin
+        for config, offset in zip(self.array_configs, array_offsets(len(self.array_configs))):
+            config['offset'] = offset
+
     def get_array_configuration(self, index):
         # Adjust index to zero-based for internal processing
         zero_based_index = index - 1
         if 0 <= zero_based_index < len(self.array_configs):
-            return self.array_configs[zero_based_index]
+            config = self.array_configs[zero_based_index]
+            return config['spacing'], config['num_elements'], config['curvature_angle']
+        else:
+            raise IndexError("Array index out of range")
+
+    def get_array_placement(self, index):
+        """Return the (offset, rotation) of an array, index 1-based."""
+        zero_based_index = index - 1
+        if 0 <= zero_based_index < len(self.array_configs):
+            config = self.array_configs[zero_based_index]
+            return config['offset'], config['rotation']
         else:
             raise IndexError("Array index out of range")
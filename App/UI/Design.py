@@ -278,7 +278,7 @@ class Ui_MainWindow(object):
         intensityMapItem.setLabel('left', 'Frequency (Hz)', color='w')
         intensityMapItem.setLabel('bottom', 'Time (s)', color='w')
         intensityMapItem.hideButtons()
-        intensityMapItem.getViewBox().setMouseEnabled(x=False, y=False)
+        intensityMapItem.getViewBox().setMouseEnabled(x=True, y=True)  # Zoom/pan selects the rendered region
 
         # Add ImageItem to Intensity Map
         self.intensityImageItem = pg.ImageItem()
@@ -313,6 +313,12 @@ class Ui_MainWindow(object):
         arrayShapeItem.setLabel('left', '', color='w')  # No labels as requested
         arrayShapeItem.setLabel('bottom', '', color='w')
 
+        # Performance overlay on top of the intensity map, hidden until toggled
+        self.performance_overlay = QtWidgets.QLabel(self.graphWidget1)
+        self.performance_overlay.setStyleSheet("color: #E0E0E0; background-color: rgba(0, 0, 0, 160); border: none; padding: 4px;")
+        self.performance_overlay.move(10, 10)
+        self.performance_overlay.hide()
+
         # Store references for updates
         self.intensityMapItem = intensityMapItem
         self.beamProfileItem = beamProfileItem
@@ -504,13 +510,26 @@ class Ui_MainWindow(object):
     # --------------------------------------------------------------------------------------------------------------------------------------
 
     def updateVisualization(self):
+        # Apply the current parameters to every array, or only to the selected one
         spacing_factor = 5
-        self.visualization_widget.editArray(
-            index=1,
-            spacing=self.current_elements_spacing * spacing_factor,
-            num_elements=self.current_elements_number,
-            curvature_angle=self.current_array_curvature_angle,
-        )
+        if self.current_selected_ALL_array:
+            indices = range(1, len(self.visualization_widget.array_configs) + 1)
+        else:
+            indices = [self.current_selected_array]
+        for index in indices:
+            self.visualization_widget.editArray(
+                index=index,
+                spacing=self.current_elements_spacing * spacing_factor,
+                num_elements=self.current_elements_number,
+                curvature_angle=self.current_array_curvature_angle,
+            )
+
+    def updatePerformanceOverlay(self, compute_ms, render_ms, dropped_frames, over_budget_frames):
+        compute_text = "-" if compute_ms is None else f"{compute_ms:.1f} ms"
+        render_text = "-" if render_ms is None else f"{render_ms:.1f} ms"
+        self.performance_overlay.setText(f"Compute: {compute_text}\nRender: {render_text}\n"
+                                         f"Dropped frames: {dropped_frames}\nOver budget: {over_budget_frames}")
+        self.performance_overlay.adjustSize()
 
     # --------------------------------------------------------------------------------------------------------------------------------------
     def return_main_initial_button(self):
@@ -525,10 +544,13 @@ class Ui_MainWindow(object):
             self.show_button([self.operating_frequency_button, self.steering_angle_button])
 
     def toggle_current_selected_array(self):
+        # Cycle All Arrays -> Array 1 -> ... -> Array N -> All Arrays
         if self.current_selected_ALL_array:
             self.current_selected_ALL_array = not self.current_selected_ALL_array
-
-        next_selected_array = self.current_selected_array
+            next_selected_array = 1
+        else:
+            next_selected_array = self.current_selected_array + 1
+        self.current_selected_array = next_selected_array
 
         if next_selected_array <= self.current_arrays_number:
             self.current_selected_array_button.setText(f"Array {next_selected_array}")